@@ -8,6 +8,7 @@ from theatre.models import (
     Performance,
     Reservation,
     Ticket,
+    SeatHold,
 )
 
 admin.site.register(Genre)
@@ -17,3 +18,4 @@ admin.site.register(TheatreHall)
 admin.site.register(Performance)
 admin.site.register(Reservation)
 admin.site.register(Ticket)
+admin.site.register(SeatHold)
@@ -0,0 +1,256 @@
+"""Async read endpoints for serving under ASGI
+
+The viewsets reuse querysets, filters, permissions and serializers of
+their sync counterparts, so responses are the same. Queries issued by
+the views go through the async queryset API, pages included. DRF
+internals that may query on their own (authentication, serialization of
+relations, conditional GET validators, card cache fills) are wrapped
+with ``sync_to_async``.
+"""
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    CursorPagination,
+    PageNumberPagination,
+    _reverse_ordering,
+)
+from rest_framework.response import Response
+
+from theatre.cache import absolute_card_urls, get_play_cards
+from theatre.fieldsets import check_fields, requested_fieldset, trim_data
+from theatre.serializers import PlayListSerializer
+from theatre.views import (
+    PerformanceViewSet,
+    PlayViewSet,
+    ReservationViewSet,
+)
+
+
+class AsyncViewSetMixin:
+    """Dispatch requests to coroutine ``list`` and ``retrieve`` actions"""
+
+    http_method_names = ["get", "head", "options"]
+    schema = None
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        # the view returns the dispatch coroutine for Django to await
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            method = request.method.lower()
+            if method not in self.http_method_names:
+                self.http_method_not_allowed(request, *args, **kwargs)
+            handler = getattr(self, method, None)
+            if handler is None:
+                self.http_method_not_allowed(request, *args, **kwargs)
+
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (
+            queryset.model.DoesNotExist,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise Http404
+
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def _apaginate_page_number(self, paginator, queryset):
+        request = self.request
+        page_size = paginator.get_page_size(request)
+        if not page_size:
+            return None
+
+        django_paginator = paginator.django_paginator_class(
+            queryset, page_size
+        )
+        # cached property, page lookups below reuse it instead of querying
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                paginator.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        page.object_list = [obj async for obj in page.object_list]
+
+        if django_paginator.num_pages > 1 and paginator.template is not None:
+            paginator.display_page_controls = True
+        paginator.page = page
+        paginator.request = request
+        return page.object_list
+
+    async def _apaginate_cursor(self, paginator, queryset):
+        request = self.request
+        paginator.page_size = paginator.get_page_size(request)
+        if not paginator.page_size:
+            return None
+
+        paginator.base_url = request.build_absolute_uri()
+        paginator.ordering = paginator.get_ordering(request, queryset, self)
+        paginator.cursor = paginator.decode_cursor(request)
+        if paginator.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = paginator.cursor
+
+        if reverse:
+            queryset = queryset.order_by(
+                *_reverse_ordering(paginator.ordering)
+            )
+        else:
+            queryset = queryset.order_by(*paginator.ordering)
+        if current_position is not None:
+            order = paginator.ordering[0]
+            lookup = (
+                "lt"
+                if paginator.cursor.reverse != order.startswith("-")
+                else "gt"
+            )
+            queryset = queryset.filter(
+                **{f"{order.lstrip('-')}__{lookup}": current_position}
+            )
+
+        # one extra row tells whether a page follows
+        stop = offset + paginator.page_size + 1
+        results = [obj async for obj in queryset[offset:stop]]
+        page = results[: paginator.page_size]
+        if len(results) > len(page):
+            has_following = True
+            following_position = paginator._get_position_from_instance(
+                results[-1], paginator.ordering
+            )
+        else:
+            has_following = False
+            following_position = None
+
+        if reverse:
+            page.reverse()
+            paginator.has_next = current_position is not None or offset > 0
+            paginator.has_previous = has_following
+            paginator.next_position = current_position
+            paginator.previous_position = following_position
+        else:
+            paginator.has_next = has_following
+            paginator.has_previous = current_position is not None or offset > 0
+            paginator.next_position = following_position
+            paginator.previous_position = current_position
+
+        if (
+            paginator.has_previous or paginator.has_next
+        ) and paginator.template is not None:
+            paginator.display_page_controls = True
+        paginator.page = page
+        return page
+
+    async def apaginate_queryset(self, queryset):
+        """``paginate_queryset`` reading the page with the async ORM"""
+        paginator = self.paginator
+        if isinstance(paginator, CursorPagination):
+            return await self._apaginate_cursor(paginator, queryset)
+        if isinstance(paginator, PageNumberPagination):
+            return await self._apaginate_page_number(paginator, queryset)
+        return await sync_to_async(self.paginate_queryset)(queryset)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = await self.apaginate_queryset(queryset)
+        objects = page if page is not None else [obj async for obj in queryset]
+        # nested and expanded fields may query relations not prefetched
+        data = await sync_to_async(
+            lambda: self.get_serializer(objects, many=True).data
+        )()
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+class AsyncPlayViewSet(AsyncViewSetMixin, PlayViewSet):
+    async def _list(self, request, *args, **kwargs):
+        fields, expand = requested_fieldset(request)
+        if expand:
+            return await self.alist(request, *args, **kwargs)
+        if fields is not None:
+            check_fields(fields, PlayListSerializer.Meta.fields)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        play_ids = [
+            play_id async for play_id in queryset.values_list("pk", flat=True)
+        ]
+        cards = await sync_to_async(get_play_cards)(play_ids)
+        return Response(trim_data(absolute_card_urls(request, cards), fields))
+
+    async def list(self, request, *args, **kwargs):
+        return await self._aconditional(self._list, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self._aconditional(
+            self.aretrieve, request, *args, **kwargs
+        )
+
+
+class AsyncPerformanceViewSet(AsyncViewSetMixin, PerformanceViewSet):
+    async def _retrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        # the detail serializer reads seat holds from the database
+        data = await sync_to_async(
+            lambda: self.get_serializer(instance).data
+        )()
+        return Response(data)
+
+    async def list(self, request, *args, **kwargs):
+        return await self._aconditional(self.alist, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self._aconditional(
+            self._retrieve, request, *args, **kwargs
+        )
+
+
+class AsyncReservationViewSet(AsyncViewSetMixin, ReservationViewSet):
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
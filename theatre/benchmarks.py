@@ -0,0 +1,129 @@
+"""Latency and query-count benchmarks of the API endpoints
+
+Budgets are the most queries one request of an endpoint may run with
+every cache cold, so they hold whatever the cache configuration. Cache
+hits only lower the counts.
+"""
+import statistics
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from theatre.models import Genre, Performance, Play, Reservation
+from user.authentication import ClaimsTokenObtainPairSerializer
+
+QUERY_BUDGETS = {
+    "play-list": 6,
+    "play-list-filtered": 6,
+    "play-search": 6,
+    "play-detail": 5,
+    "performance-list": 3,
+    "performance-list-available": 3,
+    "performance-detail": 6,
+    "reservation-list": 6,
+}
+
+
+def benchmark_urls():
+    """Return the url of every benchmarked endpoint for the current data"""
+    play = Play.objects.order_by("pk").first()
+    performance = Performance.objects.order_by("pk").first()
+    genre = Genre.objects.order_by("pk").first()
+    if play is None or performance is None or genre is None:
+        return None
+
+    play_list = reverse("theatre:play-list")
+    performance_list = reverse("theatre:performance-list")
+    return {
+        "play-list": play_list,
+        "play-list-filtered": f"{play_list}?genres={genre.pk}",
+        "play-search": f"{play_list}?search={play.title.split()[-1]}",
+        "play-detail": reverse("theatre:play-detail", args=[play.pk]),
+        "performance-list": performance_list,
+        "performance-list-available": (
+            f"{performance_list}?min_available=10&play={play.pk}"
+        ),
+        "performance-detail": reverse(
+            "theatre:performance-detail", args=[performance.pk]
+        ),
+        "reservation-list": reverse("theatre:reservation-list"),
+    }
+
+
+def _percentile(timings, percent):
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[
+        percent - 1
+    ]
+
+
+def run_benchmarks(user, requests=50, warmup=5, names=None):
+    """Request every endpoint as ``user``, returns results by endpoint
+
+    Throttling is disabled while the benchmarks run.
+    """
+    urls = benchmark_urls()
+    if urls is None:
+        return None
+
+    token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+    aliases = [settings.DATABASE_PRIMARY, *settings.DATABASE_REPLICAS]
+
+    results = {}
+    with override_settings(
+        ALLOWED_HOSTS=["testserver"], THROTTLE_ENABLED=False
+    ):
+        for name, url in urls.items():
+            if names and name not in names:
+                continue
+
+            for _ in range(warmup):
+                client.get(url)
+
+            timings = []
+            queries = 0
+            status_codes = set()
+            for _ in range(requests):
+                with ExitStack() as stack:
+                    captures = [
+                        stack.enter_context(
+                            CaptureQueriesContext(connections[alias])
+                        )
+                        for alias in aliases
+                    ]
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries = max(
+                    queries, sum(len(capture) for capture in captures)
+                )
+                status_codes.add(response.status_code)
+
+            results[name] = {
+                "url": url,
+                "requests": requests,
+                "p50_ms": round(_percentile(timings, 50), 2),
+                "p95_ms": round(_percentile(timings, 95), 2),
+                "p99_ms": round(_percentile(timings, 99), 2),
+                "queries": queries,
+                "budget": QUERY_BUDGETS[name],
+                "status_codes": sorted(status_codes),
+            }
+    return results
+
+
+def benchmark_user():
+    """Return a user with reservations, or any user"""
+    users = get_user_model().objects.order_by("pk")
+    reservation = Reservation.objects.order_by("-pk").first()
+    if reservation is not None:
+        users = users.filter(pk=reservation.user_id)
+    return users.first()
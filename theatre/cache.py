@@ -0,0 +1,162 @@
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+from theatre.fieldsets import check_fields, requested_fieldset, trim_data
+from theatre.models import Play
+from theatre.serializers import PlayListSerializer
+
+RESPONSE_CACHE = "responses"
+
+RESPONSE_VERSION_CACHE = "response_versions"
+
+PLAY_CARD_CACHE = "play_cards"
+
+
+def _version_key(model):
+    return f"version:{model._meta.label_lower}"
+
+
+def get_version(model):
+    """Return the current cache version of a model's responses
+
+    A missing counter (never set or evicted) starts from the current time,
+    so it can not fall back to a version that has cached responses.
+    Versions live in a cache shared by all processes, responses may be
+    cached per process.
+    """
+    cache = caches[RESPONSE_VERSION_CACHE]
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_version(model):
+    """Invalidate every cached response of a model"""
+    cache = caches[RESPONSE_VERSION_CACHE]
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+class CachedListMixin:
+    """Serve list responses as pre-rendered bytes from the response cache
+
+    Cache keys include the model version bumped on every write, so stale
+    entries are never read and are left to the cache eviction. Only JSON
+    responses are cached, permissions and throttles run as usual.
+    """
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if renderer.format != "json":
+            return super().list(request, *args, **kwargs)
+
+        cache = caches[RESPONSE_CACHE]
+        model = self.get_queryset().model
+        key = (
+            f"response:{model._meta.label_lower}:{get_version(model)}:"
+            f"{request.accepted_media_type}:{request.get_full_path()}"
+        )
+
+        content = cache.get(key)
+        if content is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            content = renderer.render(
+                response.data,
+                request.accepted_media_type,
+                self.get_renderer_context(),
+            )
+            cache.set(key, content)
+
+        return HttpResponse(content, content_type=renderer.media_type)
+
+
+def _play_card_key(play_id):
+    return f"play-card:{play_id}"
+
+
+def render_play_cards(play_ids):
+    """Serialize plays with ``PlayListSerializer``, keyed by play id
+
+    Cards are rendered without a request, so images keep relative urls.
+    """
+    plays = Play.objects.filter(pk__in=play_ids).prefetch_related(
+        "genres", "actors"
+    )
+    return {play.pk: dict(PlayListSerializer(play).data) for play in plays}
+
+
+def refresh_play_cards(play_ids):
+    """Re-render cached cards of the given plays, dropping deleted ones"""
+    play_ids = set(play_ids)
+    cards = render_play_cards(play_ids)
+    cache = caches[PLAY_CARD_CACHE]
+    cache.set_many(
+        {_play_card_key(play_id): card for play_id, card in cards.items()}
+    )
+    cache.delete_many(
+        [_play_card_key(play_id) for play_id in play_ids - cards.keys()]
+    )
+    return len(cards)
+
+
+def get_play_cards(play_ids):
+    """Return cards of the given plays in order, rendering missing ones"""
+    cache = caches[PLAY_CARD_CACHE]
+    cached = cache.get_many([_play_card_key(play_id) for play_id in play_ids])
+    cards = {
+        play_id: cached[_play_card_key(play_id)]
+        for play_id in play_ids
+        if _play_card_key(play_id) in cached
+    }
+
+    missing = [play_id for play_id in play_ids if play_id not in cards]
+    if missing:
+        rendered = render_play_cards(missing)
+        for play_id, card in rendered.items():
+            # never overwrite a card refreshed in the meantime
+            cache.add(_play_card_key(play_id), card)
+        cards.update(rendered)
+
+    return [cards[play_id] for play_id in play_ids if play_id in cards]
+
+
+def absolute_card_urls(request, cards):
+    """Make image urls of cards rendered without a request absolute"""
+    for card in cards:
+        if card["image"]:
+            card["image"] = request.build_absolute_uri(card["image"])
+        card["image_variants"] = {
+            name: request.build_absolute_uri(url)
+            for name, url in card["image_variants"].items()
+        }
+    return cards
+
+
+class PlayCardListMixin:
+    """List plays by stitching together cached ``PlayListSerializer``
+    cards, only the ids of the filtered plays are queried
+    """
+
+    def list(self, request, *args, **kwargs):
+        fields, expand = requested_fieldset(request)
+        if expand:
+            # cards hold related names, expanded objects are serialized
+            return super().list(request, *args, **kwargs)
+        if fields is not None:
+            check_fields(fields, PlayListSerializer.Meta.fields)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        cards = get_play_cards(list(queryset.values_list("pk", flat=True)))
+        return Response(trim_data(absolute_card_urls(request, cards), fields))
@@ -0,0 +1,79 @@
+import hashlib
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """Answer If-None-Match / If-Modified-Since requests with 304
+
+    Views implement ``get_validators`` returning the parts of an ETag and
+    the last modification time of the response, computed without
+    serializing it. Validators are checked after permissions, right
+    before the list or retrieve handler would run. The ETag also depends
+    on the query string, which selects filters and sparse fieldsets.
+    """
+
+    def get_validators(self):
+        """Return ``(etag_parts, last_modified)`` or None to skip"""
+        return None
+
+    def _check_validators(self, request, validators):
+        """Return the 304/412 response (or None) and the validator headers"""
+        etag_parts, last_modified = validators
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        if query:
+            etag_parts = (
+                *etag_parts,
+                hashlib.sha1(query.encode()).hexdigest()[:16],
+            )
+        etag = quote_etag(
+            "-".join(
+                str(part)
+                for part in (request.accepted_renderer.format, *etag_parts)
+            )
+        )
+        timestamp = (
+            int(last_modified.timestamp()) if last_modified else None
+        )
+
+        headers = {"ETag": etag}
+        if timestamp is not None:
+            headers["Last-Modified"] = http_date(timestamp)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        return response, headers
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        response, headers = self._check_validators(request, validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    async def _aconditional(self, handler, request, *args, **kwargs):
+        """``_conditional`` for coroutine handlers of async views"""
+        validators = await sync_to_async(self.get_validators)()
+        if validators is None:
+            return await handler(request, *args, **kwargs)
+
+        response, headers = self._check_validators(request, validators)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,34 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SeatsTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are already taken."
+    default_code = "seats_taken"
+
+    def __init__(self, taken_seats, detail=None, code=None):
+        super().__init__(detail, code)
+        self.detail = {
+            "detail": self.detail,
+            "taken_seats": [
+                {"performance": performance_id, "row": row, "seat": seat}
+                for performance_id, row, seat in sorted(taken_seats)
+            ],
+        }
+
+
+class HallDoubleBooked(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The theatre hall is already booked at some show times."
+    default_code = "hall_double_booked"
+
+    def __init__(self, conflicts, detail=None, code=None):
+        super().__init__(detail, code)
+        self.detail = {
+            "detail": self.detail,
+            "conflicts": [
+                {"show_time": show_time, "performance": performance_id}
+                for show_time, performance_id in conflicts
+            ],
+        }
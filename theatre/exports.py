@@ -0,0 +1,109 @@
+"""
+Streaming exports of sold tickets with their reservation, performance,
+play and hall, one row per ticket.
+
+Rows are read with ``QuerySet.iterator`` (a server-side cursor on
+PostgreSQL) and encoded as they are produced, so memory stays constant
+whatever the size of the export.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from theatre.models import Ticket
+from theatre.params import param_to_datetime
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+# column name -> Ticket lookup
+EXPORT_COLUMNS = {
+    "reservation_id": "reservation_id",
+    "reserved_at": "reservation__created_at",
+    "user_id": "reservation__user_id",
+    "user_email": "reservation__user__email",
+    "ticket_id": "id",
+    "row": "row",
+    "seat": "seat",
+    "performance_id": "performance_id",
+    "show_time": "performance__show_time",
+    "play_id": "performance__play_id",
+    "play_title": "performance__play__title",
+    "theatre_hall_id": "performance__theatre_hall_id",
+    "theatre_hall_name": "performance__theatre_hall__name",
+}
+
+
+def export_filters(date_from=None, date_to=None):
+    """Ticket lookups of reservations made between two dates"""
+    filters = {}
+    if date_from:
+        filters["reservation__created_at__gte"], _ = param_to_datetime(
+            "date_from", date_from
+        )
+    if date_to:
+        created_to, is_date = param_to_datetime(
+            "date_to", date_to, end_of_day=True
+        )
+        lookup = "lt" if is_date else "lte"
+        filters[f"reservation__created_at__{lookup}"] = created_to
+    return filters
+
+
+def export_queryset(**filters):
+    """Ticket rows ordered by reservation, ``filters`` apply to Ticket"""
+    return (
+        Ticket.objects.filter(**filters)
+        .order_by("reservation_id", "id")
+        .values_list(*EXPORT_COLUMNS.values())
+    )
+
+
+class _Echo:
+    """File-like object returning what is written, used by csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in row
+        )
+
+
+def _ndjson_lines(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(EXPORT_COLUMNS, row))) + "\n"
+
+
+def export_lines(queryset, output):
+    """Yield the lines of ``queryset`` rows encoded as CSV or NDJSON"""
+    rows = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    if output == "csv":
+        return _csv_lines(rows)
+    return _ndjson_lines(rows)
+
+
+def export_chunks(lines, size=64 * 1024):
+    """Join lines into chunks of about ``size`` characters"""
+    chunk = []
+    length = 0
+    for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(chunk)
+            chunk = []
+            length = 0
+    if chunk:
+        yield "".join(chunk)
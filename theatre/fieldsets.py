@@ -0,0 +1,122 @@
+"""
+Sparse fieldsets selected with the ``fields`` and ``expand`` query
+parameters of read requests.
+
+``?fields=id,title`` keeps the listed fields of a response, dotted names
+select fields of nested serializers (``?fields=id,tickets.row``).
+``?expand=genres`` replaces a field with the nested serializer listed in
+``expandable_fields``. Views read the same selection to skip the joins,
+prefetches and columns the response does not need.
+"""
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type=str,
+        description="Only return the listed fields, nested with dots "
+        "(ex. ?fields=id,title)",
+        required=False,
+    ),
+    OpenApiParameter(
+        "expand",
+        type=str,
+        description="Return related objects instead of their names "
+        "(ex. ?expand=genres,actors)",
+        required=False,
+    ),
+]
+
+
+def parse_fieldset(value):
+    """Parse ``id,tickets.row`` into ``{"id": {}, "tickets": {"row": {}}}``"""
+    fieldset = {}
+    for path in value.split(","):
+        node = fieldset
+        for name in path.strip().split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return fieldset
+
+
+def requested_fieldset(request):
+    """Return the ``fields`` (None for all) and ``expand`` of a request"""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, {}
+    fields = request.query_params.get("fields")
+    return (
+        parse_fieldset(fields) if fields else None,
+        parse_fieldset(request.query_params.get("expand", "")),
+    )
+
+
+def check_fields(fields, available):
+    unknown = fields.keys() - set(available)
+    if unknown:
+        raise ValidationError(
+            {"fields": f"Unknown fields: {', '.join(sorted(unknown))}."}
+        )
+
+
+def trim_data(data, fields):
+    """Keep the selected ``fields`` of already serialized data"""
+    if fields is None:
+        return data
+    if isinstance(data, list):
+        return [trim_data(item, fields) for item in data]
+    if not isinstance(data, dict):
+        return data
+    check_fields(fields, data)
+    return {
+        name: trim_data(value, fields[name] or None)
+        for name, value in data.items()
+        if name in fields
+    }
+
+
+class SparseFieldsetMixin:
+    """Serializer limited to the fields selected by the request
+
+    The top-level serializer reads the query parameters, nested sparse
+    serializers get their part of the selection from their parent.
+    """
+
+    # field name -> callable returning the serializer used when expanded
+    expandable_fields = {}
+
+    def _fieldset(self):
+        if hasattr(self, "_sparse_fieldset"):
+            return self._sparse_fieldset
+
+        parent = self.parent
+        if parent is not None and getattr(parent, "many", False):
+            parent = parent.parent
+        if parent is not None:
+            return None, {}
+        return requested_fieldset(self.context.get("request"))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, expand = self._fieldset()
+
+        for name in expand.keys() & self.expandable_fields.keys():
+            fields[name] = self.expandable_fields[name]()
+
+        if selected is not None:
+            check_fields(selected, fields)
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in selected
+            }
+
+        for name, field in fields.items():
+            nested = getattr(field, "child", field)
+            if isinstance(nested, SparseFieldsetMixin):
+                nested._sparse_fieldset = (
+                    selected[name] or None if selected else None,
+                    expand.get(name, {}),
+                )
+        return fields
@@ -0,0 +1,107 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from theatre.cache import refresh_play_cards
+from theatre.models import Play
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = "uploads/movies/variants/"
+
+# variant name: (bounding box, format)
+IMAGE_VARIANTS = {
+    "thumbnail": ((320, 320), "JPEG"),
+    "thumbnail_webp": ((320, 320), "WEBP"),
+    "webp": ((1280, 1280), "WEBP"),
+}
+
+EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp"}
+
+_executor = None
+
+
+def _render_variant(image, size, image_format):
+    variant = image.copy()
+    variant.thumbnail(size)
+    if image_format == "JPEG" and variant.mode != "RGB":
+        variant = variant.convert("RGB")
+    buffer = BytesIO()
+    variant.save(buffer, format=image_format, quality=80)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_image_variants(play_id):
+    """Store resized copies of a play image and record their paths
+
+    Variants of an image replaced while they were rendered are thrown
+    away, the newer upload schedules its own. Returns whether the play
+    got new variants.
+    """
+    play = Play.objects.filter(pk=play_id).only("image", "image_variants")
+    play = play.first()
+    if play is None or not play.image:
+        return False
+
+    with play.image.open("rb") as image_file:
+        image = ImageOps.exif_transpose(Image.open(image_file))
+        image.load()
+
+    stem, _ = os.path.splitext(os.path.basename(play.image.name))
+    variants = {}
+    for name, (size, image_format) in IMAGE_VARIANTS.items():
+        variants[name] = default_storage.save(
+            f"{VARIANTS_DIR}{stem}-{name}.{EXTENSIONS[image_format]}",
+            _render_variant(image, size, image_format),
+        )
+
+    updated = Play.objects.filter(pk=play_id, image=play.image.name).update(
+        image_variants=variants, updated_at=timezone.now()
+    )
+    stale = play.image_variants if updated else variants
+    for path in stale.values():
+        default_storage.delete(path)
+    if updated:
+        refresh_play_cards([play_id])
+    return bool(updated)
+
+
+def _process_in_worker(play_id):
+    try:
+        generate_image_variants(play_id)
+    except Exception:
+        logger.exception("Image variants of play %s failed", play_id)
+    finally:
+        connection.close()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PLAY_IMAGE_WORKERS,
+            thread_name_prefix="play-images",
+        )
+    return _executor
+
+
+def schedule_image_variants(play_id):
+    """Render variants of a play image after the current transaction
+
+    The work runs in a local thread pool, or inline when
+    ``PLAY_IMAGE_WORKERS`` is 0.
+    """
+    if settings.PLAY_IMAGE_WORKERS:
+        transaction.on_commit(
+            lambda: _get_executor().submit(_process_in_worker, play_id)
+        )
+    else:
+        transaction.on_commit(lambda: generate_image_variants(play_id))
@@ -0,0 +1,78 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from theatre.benchmarks import QUERY_BUDGETS, benchmark_user, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles and query counts of the API endpoints "
+        "against the current data, fail when a query budget is exceeded"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Measured requests per endpoint",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Unmeasured requests per endpoint sent first",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            choices=QUERY_BUDGETS,
+            help="Only benchmark this endpoint, may be repeated",
+        )
+        parser.add_argument(
+            "--json", help="Also write the results to this file"
+        )
+
+    def handle(self, *args, **options):
+        user = benchmark_user()
+        if user is None:
+            raise CommandError("No users to benchmark as, run seed_theatre.")
+
+        results = run_benchmarks(
+            user,
+            requests=max(options["requests"], 1),
+            warmup=options["warmup"],
+            names=options["endpoint"],
+        )
+        if results is None:
+            raise CommandError("No data to benchmark, run seed_theatre.")
+
+        self.stdout.write(
+            f"{'endpoint':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}{'budget':>8}"
+        )
+        failures = []
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<28}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+                f"{result['p99_ms']:>9.2f}{result['queries']:>9}"
+                f"{result['budget']:>8}"
+            )
+            if result["queries"] > result["budget"]:
+                failures.append(
+                    f"{name} ran {result['queries']} queries, "
+                    f"budget is {result['budget']}"
+                )
+            if result["status_codes"] != [200]:
+                failures.append(
+                    f"{name} answered {result['status_codes']}"
+                )
+
+        if options["json"]:
+            with open(options["json"], "w") as output:
+                json.dump(results, output, indent=2)
+
+        if failures:
+            raise CommandError("; ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All query budgets met."))
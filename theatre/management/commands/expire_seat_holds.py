@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from theatre.seat_map import expire_holds
+
+
+class Command(BaseCommand):
+    help = "Release expired seat holds in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of holds released per transaction",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep sweeping every N seconds instead of running once",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            expired = expire_holds(options["batch_size"])
+            self.stdout.write(f"{expired} expired seat holds released.")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Seat holds swept!"))
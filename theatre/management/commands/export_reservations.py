@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from theatre.exports import (
+    EXPORT_FORMATS,
+    export_chunks,
+    export_filters,
+    export_lines,
+    export_queryset,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream tickets of all reservations as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            choices=EXPORT_FORMATS,
+            default="ndjson",
+            help="Export format",
+        )
+        parser.add_argument(
+            "--date-from", help="Reservations made since date or datetime"
+        )
+        parser.add_argument(
+            "--date-to",
+            help="Reservations made up to date or datetime, inclusive",
+        )
+        parser.add_argument(
+            "--file", help="File to write, the standard output by default"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            filters = export_filters(options["date_from"], options["date_to"])
+        except ValidationError as error:
+            raise CommandError(error.detail)
+
+        chunks = export_chunks(
+            export_lines(export_queryset(**filters), options["output"])
+        )
+        if not options["file"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["file"], "w", newline="", encoding="utf-8") as file:
+            for chunk in chunks:
+                file.write(chunk)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from theatre.images import generate_image_variants
+from theatre.models import Play
+
+
+class Command(BaseCommand):
+    help = "Render resized variants of uploaded play images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-render variants of plays that already have them",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rendering play image variants...")
+        plays = Play.objects.exclude(image="").exclude(image=None)
+        if not options["all"]:
+            plays = plays.filter(image_variants={})
+
+        rendered = 0
+        for play_id in plays.order_by("pk").values_list("pk", flat=True):
+            try:
+                rendered += generate_image_variants(play_id)
+            except (OSError, ValueError) as error:
+                self.stderr.write(f"Play {play_id}: {error}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{rendered} play images processed.")
+        )
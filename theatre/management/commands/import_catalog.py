@@ -0,0 +1,292 @@
+import csv
+import json
+import sys
+from contextlib import nullcontext
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from theatre.cache import bump_version
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+from theatre.signals import plays_changed
+
+KINDS = ("genres", "actors", "plays", "performances")
+
+# separator of genre and actor names in a CSV cell
+LIST_SEPARATOR = "|"
+
+
+class DryRun(Exception):
+    """Raised to roll back the import transaction"""
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name} {last_name}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Import genres, actors, plays or performances from CSV or JSON "
+        "lines, re-running an import updates the existing rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=KINDS, help="Type of records")
+        parser.add_argument(
+            "path", help="File to read, '-' reads the standard input"
+        )
+        parser.add_argument(
+            "--format",
+            choices=("csv", "jsonl"),
+            help="Input format, guessed from the file extension by default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of records written per query",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and count the records without saving them",
+        )
+
+    def handle(self, *args, **options):
+        input_format = options["format"] or (
+            "csv" if options["path"].endswith(".csv") else "jsonl"
+        )
+        self.batch_size = options["batch_size"]
+        self.counts = {"created": 0, "updated": 0, "unchanged": 0}
+        self.changed_models = set()
+        self.genres = dict(Genre.objects.values_list("name", "pk"))
+        self.actors = {
+            _full_name(first_name, last_name): pk
+            for first_name, last_name, pk in Actor.objects.values_list(
+                "first_name", "last_name", "pk"
+            )
+        }
+        self.halls = dict(TheatreHall.objects.values_list("name", "pk"))
+        import_batch = getattr(self, f"import_{options['kind']}")
+
+        if options["path"] == "-":
+            stream = sys.stdin
+        else:
+            stream = open(options["path"], newline="", encoding="utf-8")
+        records = self.read(stream, input_format)
+
+        # batches are committed one by one, a dry run imports all of them
+        # in a transaction rolled back at the end
+        outer = transaction.atomic() if options["dry_run"] else nullcontext()
+        try:
+            with outer:
+                while batch := list(islice(records, self.batch_size)):
+                    with transaction.atomic():
+                        import_batch(batch)
+                if options["dry_run"]:
+                    raise DryRun()
+        except DryRun:
+            pass
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if not options["dry_run"]:
+            for model in self.changed_models:
+                bump_version(model)
+
+        summary = (
+            f"{self.counts['created']} created, "
+            f"{self.counts['updated']} updated, "
+            f"{self.counts['unchanged']} unchanged."
+        )
+        if options["dry_run"]:
+            summary = f"Dry run, nothing saved: {summary}"
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    @staticmethod
+    def read(stream, input_format):
+        """Yield ``(line, record)`` pairs without loading the whole input"""
+        if input_format == "csv":
+            reader = csv.DictReader(stream)
+            for record in reader:
+                yield reader.line_num, {
+                    key: value for key, value in record.items() if value
+                }
+            return
+
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as error:
+                raise CommandError(f"Line {line}: {error}")
+            if not isinstance(record, dict):
+                raise CommandError(f"Line {line}: expected a JSON object.")
+            yield line, record
+
+    @staticmethod
+    def required(line, record, field):
+        value = record.get(field)
+        if value in (None, ""):
+            raise CommandError(f"Line {line}: {field} is required.")
+        return value
+
+    @staticmethod
+    def names(record, field):
+        value = record.get(field) or []
+        if isinstance(value, str):
+            value = value.split(LIST_SEPARATOR)
+        return [name.strip() for name in value if name.strip()]
+
+    def resolve_genres(self, names):
+        missing = {name for name in names if name not in self.genres}
+        if missing:
+            Genre.objects.bulk_create(
+                (Genre(name=name) for name in missing), ignore_conflicts=True
+            )
+            self.genres.update(
+                Genre.objects.filter(name__in=missing).values_list(
+                    "name", "pk"
+                )
+            )
+            self.changed_models.add(Genre)
+
+    def resolve_actors(self, names):
+        missing = [name for name in set(names) if name not in self.actors]
+        if missing:
+            actors = Actor.objects.bulk_create(
+                Actor(first_name=first_name, last_name=last_name)
+                for first_name, _, last_name in (
+                    name.partition(" ") for name in missing
+                )
+            )
+            self.actors.update(
+                (name, actor.pk) for name, actor in zip(missing, actors)
+            )
+            self.changed_models.add(Actor)
+
+    def import_genres(self, batch):
+        names = {
+            self.required(line, record, "name").strip()
+            for line, record in batch
+        }
+        created = len(names - self.genres.keys())
+        self.resolve_genres(names)
+        self.counts["created"] += created
+        self.counts["unchanged"] += len(names) - created
+
+    def import_actors(self, batch):
+        names = {
+            _full_name(
+                self.required(line, record, "first_name").strip(),
+                self.required(line, record, "last_name").strip(),
+            )
+            for line, record in batch
+        }
+        created = len(names - self.actors.keys())
+        self.resolve_actors(names)
+        self.counts["created"] += created
+        self.counts["unchanged"] += len(names) - created
+
+    def import_plays(self, batch):
+        plays = {}
+        for line, record in batch:
+            title = self.required(line, record, "title").strip()
+            plays[title] = (
+                record.get("description") or None,
+                self.names(record, "genres"),
+                self.names(record, "actors"),
+            )
+        self.resolve_genres(
+            {name for _, genres, _ in plays.values() for name in genres}
+        )
+        self.resolve_actors(
+            {name for _, _, actors in plays.values() for name in actors}
+        )
+
+        existing = Play.objects.filter(title__in=plays).count()
+        Play.objects.bulk_create(
+            (
+                Play(title=title, description=description)
+                for title, (description, _, _) in plays.items()
+            ),
+            update_conflicts=True,
+            unique_fields=["title"],
+            update_fields=["description", "updated_at"],
+        )
+        play_ids = dict(
+            Play.objects.filter(title__in=plays).values_list("title", "pk")
+        )
+
+        Play.genres.through.objects.filter(
+            play_id__in=play_ids.values()
+        ).delete()
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(
+                play_id=play_ids[title], genre_id=self.genres[name]
+            )
+            for title, (_, genres, _) in plays.items()
+            for name in dict.fromkeys(genres)
+        )
+        Play.actors.through.objects.filter(
+            play_id__in=play_ids.values()
+        ).delete()
+        Play.actors.through.objects.bulk_create(
+            Play.actors.through(
+                play_id=play_ids[title], actor_id=self.actors[name]
+            )
+            for title, (_, _, actors) in plays.items()
+            for name in dict.fromkeys(actors)
+        )
+        plays_changed(play_ids.values(), reindex=True)
+
+        self.counts["created"] += len(plays) - existing
+        self.counts["updated"] += existing
+
+    def import_performances(self, batch):
+        performances = {}
+        titles = set()
+        for line, record in batch:
+            title = self.required(line, record, "play").strip()
+            hall = self.required(line, record, "theatre_hall").strip()
+            if hall not in self.halls:
+                raise CommandError(f"Line {line}: unknown hall {hall!r}.")
+            show_time = parse_datetime(
+                self.required(line, record, "show_time")
+            )
+            if show_time is None:
+                raise CommandError(f"Line {line}: invalid show_time.")
+            if timezone.is_naive(show_time):
+                show_time = timezone.make_aware(show_time)
+            performances[(title, self.halls[hall], show_time)] = line
+            titles.add(title)
+
+        play_ids = dict(
+            Play.objects.filter(title__in=titles).values_list("title", "pk")
+        )
+        for (title, _, _), line in performances.items():
+            if title not in play_ids:
+                raise CommandError(f"Line {line}: unknown play {title!r}.")
+
+        existing = set(
+            Performance.objects.filter(
+                play_id__in=play_ids.values(),
+                show_time__in={key[2] for key in performances},
+            ).values_list("play_id", "theatre_hall_id", "show_time")
+        )
+        created = Performance.objects.bulk_create(
+            Performance(
+                play_id=play_ids[title],
+                theatre_hall_id=hall_id,
+                show_time=show_time,
+            )
+            for title, hall_id, show_time in performances
+            if (play_ids[title], hall_id, show_time) not in existing
+        )
+        self.counts["created"] += len(created)
+        self.counts["unchanged"] += len(performances) - len(created)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from theatre.seat_map import rebuild_seat_maps
+
+
+class Command(BaseCommand):
+    help = "Rebuild performance seat maps from sold tickets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "performances",
+            nargs="*",
+            type=int,
+            help="Ids of performances to rebuild (all by default)",
+        )
+
+    def handle(self, *args, **options):
+        performance_ids = options["performances"] or None
+        self.stdout.write("Rebuilding seat maps...")
+        fixed = rebuild_seat_maps(performance_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f"Seat maps rebuilt, {fixed} fixed.")
+        )
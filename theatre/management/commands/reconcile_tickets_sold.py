@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from theatre.seat_map import reconcile_tickets_sold
+
+
+class Command(BaseCommand):
+    help = "Recount tickets sold per performance from Ticket rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "performances",
+            nargs="*",
+            type=int,
+            help="Ids of performances to reconcile (all by default)",
+        )
+
+    def handle(self, *args, **options):
+        performance_ids = options["performances"] or None
+        self.stdout.write("Reconciling sold tickets counters...")
+        fixed = reconcile_tickets_sold(performance_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f"Counters reconciled, {fixed} fixed.")
+        )
@@ -0,0 +1,390 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connections, router
+
+from theatre.cache import PLAY_CARD_CACHE, bump_version
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    PlaySearchDocument,
+    Reservation,
+    SeatHold,
+    TheatreHall,
+    Ticket,
+)
+from theatre.search import refresh_search_documents
+from theatre.seat_map import SeatMap
+
+SCALES = {
+    "small": {
+        "plays": 100,
+        "performances": 1_000,
+        "tickets": 20_000,
+        "users": 100,
+    },
+    "medium": {
+        "plays": 1_000,
+        "performances": 10_000,
+        "tickets": 500_000,
+        "users": 2_000,
+    },
+    "large": {
+        "plays": 10_000,
+        "performances": 100_000,
+        "tickets": 10_000_000,
+        "users": 50_000,
+    },
+}
+
+GENRES = (
+    "Drama",
+    "Comedy",
+    "Tragedy",
+    "Musical",
+    "Opera",
+    "Ballet",
+    "Farce",
+    "Satire",
+    "Melodrama",
+    "Mystery",
+    "Historical",
+    "Fantasy",
+)
+
+FIRST_NAMES = (
+    "Anna",
+    "Bohdan",
+    "Clara",
+    "Dmytro",
+    "Emma",
+    "Frank",
+    "Grace",
+    "Hugo",
+    "Iryna",
+    "Jack",
+    "Kateryna",
+    "Liam",
+    "Maria",
+    "Nazar",
+    "Olivia",
+    "Petro",
+    "Rose",
+    "Sofia",
+    "Taras",
+    "Vera",
+)
+
+LAST_NAMES = (
+    "Adams",
+    "Bondarenko",
+    "Clarke",
+    "Davies",
+    "Evans",
+    "Franko",
+    "Green",
+    "Hughes",
+    "Ivanenko",
+    "Jones",
+    "Kovalenko",
+    "Lewis",
+    "Moroz",
+    "Novak",
+    "Owens",
+    "Shevchenko",
+    "Taylor",
+    "Walker",
+)
+
+TITLE_WORDS = (
+    (
+        "The",
+        "A",
+        "Last",
+        "Silent",
+        "Golden",
+        "Broken",
+        "Midnight",
+        "Forgotten",
+        "Little",
+        "Winter",
+    ),
+    (
+        "Garden",
+        "Letter",
+        "King",
+        "Bridge",
+        "Storm",
+        "Dream",
+        "Mirror",
+        "Orchard",
+        "Harbour",
+        "Song",
+        "Wedding",
+        "Lantern",
+    ),
+)
+
+SHOW_HOURS = (12, 15, 19)
+
+SEASON_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible theatre dataset for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            choices=SCALES,
+            default="small",
+            help="Preset sizes, individual counts override them",
+        )
+        for name in ("plays", "performances", "tickets", "users"):
+            parser.add_argument(
+                f"--{name}", type=int, help=f"Number of {name} to create"
+            )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Seed of the generator, equal seeds give equal datasets",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of rows inserted per query",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete existing theatre data and seeded users first",
+        )
+
+    def handle(self, *args, **options):
+        sizes = {
+            name: options[name] if options[name] is not None else default
+            for name, default in SCALES[options["scale"]].items()
+        }
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        if options["clear"]:
+            self.clear()
+        elif Play.objects.exists():
+            raise CommandError(
+                "The database already has plays, use --clear to replace them."
+            )
+
+        self.stdout.write("Seeding theatre data...")
+        Genre.objects.bulk_create(
+            (Genre(name=name) for name in GENRES), ignore_conflicts=True
+        )
+        genres = list(Genre.objects.filter(name__in=GENRES).order_by("name"))
+        actors = self.create_actors(max(sizes["plays"] // 2, 10))
+        halls = self.create_halls()
+        users = self.create_users(max(sizes["users"], 1))
+        plays = self.create_plays(sizes["plays"], genres, actors)
+        tickets = self.create_performances(
+            sizes["performances"], sizes["tickets"], plays, halls, users
+        )
+
+        for model in (Genre, Actor, TheatreHall):
+            bump_version(model)
+        caches[PLAY_CARD_CACHE].clear()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(plays)} plays, {sizes['performances']} "
+                f"performances and {tickets} tickets."
+            )
+        )
+
+    def clear(self):
+        self.stdout.write("Deleting existing theatre data...")
+        # one flush (TRUNCATE where supported) in a transaction, .delete()
+        # would load every ticket and rewrite a seat map per deleted ticket
+        connection = connections[router.db_for_write(Play)]
+        connection.ops.execute_sql_flush(
+            connection.ops.sql_flush(
+                no_style(),
+                [
+                    model._meta.db_table
+                    for model in (
+                        Ticket,
+                        Reservation,
+                        SeatHold,
+                        Performance,
+                        Play.genres.through,
+                        Play.actors.through,
+                        PlaySearchDocument,
+                        Play,
+                        Actor,
+                        Genre,
+                        TheatreHall,
+                    )
+                ],
+            )
+        )
+        get_user_model().objects.filter(
+            email__endswith="@seed.example.com"
+        ).delete()
+
+    def create_actors(self, count):
+        return Actor.objects.bulk_create(
+            (
+                Actor(
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                )
+                for _ in range(count)
+            ),
+            batch_size=self.batch_size,
+        )
+
+    def create_halls(self):
+        return TheatreHall.objects.bulk_create(
+            TheatreHall(
+                name=f"Hall {number}",
+                rows=self.rng.randint(8, 30),
+                seats_in_row=self.rng.randint(10, 40),
+            )
+            for number in range(1, 21)
+        )
+
+    def create_users(self, count):
+        password = make_password("password")
+        user_model = get_user_model()
+        user_model.objects.bulk_create(
+            (
+                user_model(
+                    email=f"user{number}@seed.example.com", password=password
+                )
+                for number in range(1, count + 1)
+            ),
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        return list(
+            user_model.objects.filter(email__endswith="@seed.example.com")
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def play_title(self, used):
+        title = " ".join(self.rng.choice(words) for words in TITLE_WORDS)
+        if title in used:
+            title = f"{title} {len(used) + 1}"
+        used.add(title)
+        return title
+
+    def create_plays(self, count, genres, actors):
+        used = set()
+        plays = []
+        for start in range(0, count, self.batch_size):
+            batch = Play.objects.bulk_create(
+                Play(
+                    title=self.play_title(used),
+                    description=f"A play in {self.rng.randint(1, 5)} acts.",
+                )
+                for _ in range(start, min(start + self.batch_size, count))
+            )
+            Play.genres.through.objects.bulk_create(
+                Play.genres.through(play_id=play.pk, genre_id=genre.pk)
+                for play in batch
+                for genre in self.rng.sample(genres, self.rng.randint(1, 3))
+            )
+            Play.actors.through.objects.bulk_create(
+                Play.actors.through(play_id=play.pk, actor_id=actor.pk)
+                for play in batch
+                for actor in self.rng.sample(
+                    actors, min(len(actors), self.rng.randint(2, 6))
+                )
+            )
+            refresh_search_documents([play.pk for play in batch])
+            plays.extend(batch)
+        return plays
+
+    def create_performances(self, count, tickets, plays, halls, users):
+        """Create performances with sold seats, returns the ticket count"""
+        average = tickets / count if count else 0
+        created = 0
+        for start in range(0, count, self.batch_size):
+            performances = []
+            sold_seats = []
+            for _ in range(start, min(start + self.batch_size, count)):
+                hall = self.rng.choice(halls)
+                sold = min(
+                    hall.capacity,
+                    tickets - created,
+                    round(average * self.rng.uniform(0.5, 1.5)),
+                )
+                positions = self.rng.sample(range(hall.capacity), sold)
+                seat_map = SeatMap(hall.rows, hall.seats_in_row)
+                for position in positions:
+                    seat_map.take(*self.place(hall, position))
+                created += sold
+
+                performances.append(
+                    Performance(
+                        play=self.rng.choice(plays),
+                        theatre_hall=hall,
+                        show_time=SEASON_START
+                        + timedelta(
+                            days=self.rng.randrange(365),
+                            hours=self.rng.choice(SHOW_HOURS),
+                        ),
+                        seat_map=seat_map.to_bytes(),
+                        tickets_sold=sold,
+                    )
+                )
+                sold_seats.append(positions)
+
+            Performance.objects.bulk_create(performances)
+            self.create_tickets(performances, sold_seats, users)
+        return created
+
+    def create_tickets(self, performances, sold_seats, users):
+        groups = []
+        for performance, positions in zip(performances, sold_seats):
+            while positions:
+                size = self.rng.randint(1, 6)
+                groups.append((performance, positions[:size]))
+                positions = positions[size:]
+
+        for start in range(0, len(groups), self.batch_size):
+            batch = groups[start:start + self.batch_size]
+            reservations = Reservation.objects.bulk_create(
+                Reservation(user_id=self.rng.choice(users)) for _ in batch
+            )
+            Ticket.objects.bulk_create(
+                (
+                    Ticket(
+                        performance=performance,
+                        reservation=reservation,
+                        row=row,
+                        seat=seat,
+                    )
+                    for reservation, (performance, positions) in zip(
+                        reservations, batch
+                    )
+                    for row, seat in (
+                        self.place(performance.theatre_hall, position)
+                        for position in positions
+                    )
+                ),
+                batch_size=self.batch_size,
+            )
+
+    @staticmethod
+    def place(hall, position):
+        row, seat = divmod(position, hall.seats_in_row)
+        return row + 1, seat + 1
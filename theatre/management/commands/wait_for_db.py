@@ -1,14 +1,23 @@
 import time
 
-from django.db import connection
+from django.conf import settings
+from django.db import connections
 from django.db.utils import OperationalError
 from django.core.management.base import BaseCommand
 
 
 class Command(BaseCommand):
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=settings.DATABASE_PRIMARY,
+            help="Database alias to wait for",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
+        connection = connections[options["database"]]
         db_conn = None
         while not db_conn:
             try:
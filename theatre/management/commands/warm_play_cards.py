@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from theatre.cache import refresh_play_cards
+from theatre.models import Play
+
+
+class Command(BaseCommand):
+    help = "Render and cache play list cards of every play"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of plays rendered per batch",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Warming play cards...")
+        batch = []
+        warmed = 0
+        play_ids = Play.objects.order_by("pk").values_list("pk", flat=True)
+        for play_id in play_ids.iterator(chunk_size=options["batch_size"]):
+            batch.append(play_id)
+            if len(batch) == options["batch_size"]:
+                warmed += refresh_play_cards(batch)
+                batch = []
+        if batch:
+            warmed += refresh_play_cards(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"{warmed} play cards cached."))
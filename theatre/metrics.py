@@ -0,0 +1,15 @@
+from theatre_service.metrics import Counter
+
+RESERVATIONS_CREATED = Counter(
+    "theatre_reservations_created_total", "Reservations created."
+)
+
+TICKETS_CREATED = Counter(
+    "theatre_tickets_created_total", "Tickets sold through reservations."
+)
+
+SEAT_CONFLICTS = Counter(
+    "theatre_seat_conflicts_total",
+    "Reservations and holds rejected because seats were taken.",
+    labelnames=("operation",),
+)
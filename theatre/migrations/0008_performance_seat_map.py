@@ -0,0 +1,35 @@
+# Generated by Django 4.1.6 on 2026-10-18 05:57
+
+from django.db import migrations, models
+
+
+def build_seat_maps(apps, schema_editor):
+    Performance = apps.get_model("theatre", "Performance")
+    Ticket = apps.get_model("theatre", "Ticket")
+
+    for performance in Performance.objects.select_related("theatre_hall"):
+        seats_in_row = performance.theatre_hall.seats_in_row
+        size = (performance.theatre_hall.rows * seats_in_row + 7) // 8
+        bits = bytearray(size)
+        tickets = Ticket.objects.filter(performance=performance)
+        for row, seat in tickets.values_list("row", "seat"):
+            index = (row - 1) * seats_in_row + (seat - 1)
+            if 0 <= index < size * 8:
+                bits[index >> 3] |= 1 << (index & 7)
+        performance.seat_map = bytes(bits)
+        performance.save(update_fields=["seat_map"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0007_alter_play_actors_alter_play_genres"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="seat_map",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.RunPython(build_seat_maps, migrations.RunPython.noop),
+    ]
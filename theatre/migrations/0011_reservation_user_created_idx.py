@@ -0,0 +1,19 @@
+# Generated by Django 4.1.6 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0010_seathold_performance_tickets_held"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="reservation_user_created_idx",
+            ),
+        ),
+    ]
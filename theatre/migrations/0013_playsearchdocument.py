@@ -0,0 +1,113 @@
+# Generated by Django 4.1.6 on 2026-10-18 06:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+SQLITE_FTS_SQL = [
+    "CREATE VIRTUAL TABLE theatre_playsearchdocument_fts USING fts5("
+    "title, description, actors, "
+    "content='theatre_playsearchdocument', content_rowid='play_id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER theatre_playsearchdocument_fts_insert "
+    "AFTER INSERT ON theatre_playsearchdocument BEGIN "
+    "INSERT INTO theatre_playsearchdocument_fts"
+    "(rowid, title, description, actors) "
+    "VALUES (new.play_id, new.title, new.description, new.actors); END",
+    "CREATE TRIGGER theatre_playsearchdocument_fts_delete "
+    "AFTER DELETE ON theatre_playsearchdocument BEGIN "
+    "INSERT INTO theatre_playsearchdocument_fts"
+    "(theatre_playsearchdocument_fts, rowid, title, description, actors) "
+    "VALUES ('delete', old.play_id, old.title, old.description, "
+    "old.actors); END",
+    "CREATE TRIGGER theatre_playsearchdocument_fts_update "
+    "AFTER UPDATE ON theatre_playsearchdocument BEGIN "
+    "INSERT INTO theatre_playsearchdocument_fts"
+    "(theatre_playsearchdocument_fts, rowid, title, description, actors) "
+    "VALUES ('delete', old.play_id, old.title, old.description, "
+    "old.actors); "
+    "INSERT INTO theatre_playsearchdocument_fts"
+    "(rowid, title, description, actors) "
+    "VALUES (new.play_id, new.title, new.description, new.actors); END",
+]
+
+SQLITE_FTS_DROP_SQL = [
+    "DROP TABLE IF EXISTS theatre_playsearchdocument_fts",
+]
+
+POSTGRES_INDEX_SQL = [
+    "CREATE INDEX theatre_playsearchdocument_vector_idx "
+    "ON theatre_playsearchdocument USING gin (("
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', actors), 'B') || "
+    "setweight(to_tsvector('simple', description), 'C')))",
+]
+
+POSTGRES_INDEX_DROP_SQL = [
+    "DROP INDEX IF EXISTS theatre_playsearchdocument_vector_idx",
+]
+
+
+def run_for_vendor(sqlite_sql, postgres_sql):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in {"sqlite": sqlite_sql, "postgresql": postgres_sql}.get(
+            vendor, []
+        ):
+            schema_editor.execute(sql)
+
+    return run
+
+
+def build_search_documents(apps, schema_editor):
+    Play = apps.get_model("theatre", "Play")
+    PlaySearchDocument = apps.get_model("theatre", "PlaySearchDocument")
+
+    PlaySearchDocument.objects.bulk_create(
+        [
+            PlaySearchDocument(
+                play=play,
+                title=play.title,
+                description=play.description or "",
+                actors=" ".join(
+                    f"{actor.first_name} {actor.last_name}"
+                    for actor in play.actors.all()
+                ),
+            )
+            for play in Play.objects.prefetch_related("actors")
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("theatre", "0012_performance_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlaySearchDocument",
+            fields=[
+                (
+                    "play",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="theatre.play",
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("description", models.TextField(blank=True)),
+                ("actors", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(
+            run_for_vendor(SQLITE_FTS_SQL, POSTGRES_INDEX_SQL),
+            run_for_vendor(SQLITE_FTS_DROP_SQL, POSTGRES_INDEX_DROP_SQL),
+        ),
+        migrations.RunPython(
+            build_search_documents, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.6 on 2026-10-18 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0014_play_updated_at_performance_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="play",
+            name="image_variants",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
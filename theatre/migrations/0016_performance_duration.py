@@ -0,0 +1,21 @@
+# Generated by Django 4.1.6 on 2026-10-18 06:35
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0015_play_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="duration",
+            field=models.PositiveIntegerField(
+                default=120, validators=[django.core.validators.MaxValueValidator(1440)]
+            ),
+        ),
+    ]
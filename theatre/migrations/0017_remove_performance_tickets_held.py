@@ -0,0 +1,17 @@
+# Generated by Django 4.1.6 on 2026-10-18 07:15
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0016_performance_duration"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="performance",
+            name="tickets_held",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.6 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0017_remove_performance_tickets_held"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="reservation",
+            name="reservation_user_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "id"], name="reservation_user_id_idx"
+            ),
+        ),
+    ]
@@ -2,6 +2,7 @@ import os
 import uuid
 
 from django.conf import settings
+from django.core.validators import MaxValueValidator
 from django.db import models
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
@@ -53,6 +54,8 @@ class Play(models.Model):
     genres = models.ManyToManyField(Genre, related_name="plays", blank=True)
     actors = models.ManyToManyField(Actor, related_name="plays", blank=True)
     image = models.ImageField(null=True, upload_to=movie_image_file_path)
+    image_variants = models.JSONField(default=dict, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["title"]
@@ -61,8 +64,33 @@ class Play(models.Model):
         return self.title
 
 
+class PlaySearchDocument(models.Model):
+    """Denormalized text of a play kept for full-text search indexes"""
+
+    play = models.OneToOneField(
+        Play,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    actors = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.title
+
+
+# longest running time of a performance, bounds hall double-booking checks
+PERFORMANCE_MAX_MINUTES = 24 * 60
+
+
 class Performance(models.Model):
     show_time = models.DateTimeField()
+    # running time in minutes
+    duration = models.PositiveIntegerField(
+        default=120, validators=[MaxValueValidator(PERFORMANCE_MAX_MINUTES)]
+    )
     play = models.ForeignKey(
         Play,
         on_delete=models.CASCADE,
@@ -73,10 +101,28 @@ class Performance(models.Model):
         on_delete=models.CASCADE,
         related_name="performance"
     )
+    seat_map = models.BinaryField(default=b"", editable=False)
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.play.title} {str(self.show_time)}"
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["show_time"], name="performance_show_time_idx"
+            ),
+            models.Index(
+                fields=["play", "show_time"],
+                name="performance_play_time_idx",
+            ),
+            models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="performance_hall_time_idx",
+            ),
+        ]
+
 
 class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -90,6 +136,12 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "id"],
+                name="reservation_user_id_idx",
+            )
+        ]
 
 
 class Ticket(models.Model):
@@ -136,3 +188,24 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("performance", "row", "seat")
         ordering = ["row", "seat"]
+
+
+class SeatHold(models.Model):
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds",
+    )
+    seats = models.BinaryField()
+    seats_count = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{str(self.performance)} ({self.seats_count} seats)"
+
+    class Meta:
+        ordering = ["expires_at"]
@@ -0,0 +1,34 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+def param_to_datetime(name, value, end_of_day=False):
+    """Parse a datetime, or a date taken at its start (or end)
+
+    Returns the parsed value and whether only a date was given.
+    """
+    try:
+        parsed_date = parse_date(value)
+    except ValueError:
+        parsed_date = None
+
+    if parsed_date is not None:
+        if end_of_day:
+            parsed_date += timedelta(days=1)
+        parsed = datetime.combine(parsed_date, time.min)
+    else:
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError(
+                {name: "A valid date or datetime is required."}
+            )
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed, parsed_date is not None
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from theatre.exceptions import HallDoubleBooked
+from theatre.models import PERFORMANCE_MAX_MINUTES, Performance, TheatreHall
+
+
+def recurring_show_times(
+    date_from, date_to, times, weekdays=None, exclude_dates=()
+):
+    """Return sorted show times of a recurrence between two dates
+
+    ``weekdays`` are numbered from Monday (0), all days match when it is
+    not given. Times are local to the current time zone, dates of
+    ``exclude_dates`` are skipped.
+    """
+    exclude_dates = set(exclude_dates)
+    show_times = []
+    day = date_from
+    while day <= date_to:
+        if day not in exclude_dates and (
+            weekdays is None or day.weekday() in weekdays
+        ):
+            show_times.extend(
+                timezone.make_aware(datetime.combine(day, show_time))
+                for show_time in times
+            )
+        day += timedelta(days=1)
+    return sorted(set(show_times))
+
+
+def find_hall_conflicts(theatre_hall_id, show_times, duration):
+    """Return ``(show_time, performance_id)`` pairs of overlapping shows
+
+    New shows last ``duration`` minutes. Existing performances are read
+    with one range query on the hall and show time index, bounded by the
+    longest possible running time, and merged with the new shows by start
+    time. Overlaps between new shows are reported with a None id.
+    """
+    if not show_times:
+        return []
+    length = timedelta(minutes=duration)
+    existing = (
+        Performance.objects.filter(
+            theatre_hall_id=theatre_hall_id,
+            show_time__gt=show_times[0]
+            - timedelta(minutes=PERFORMANCE_MAX_MINUTES),
+            show_time__lt=show_times[-1] + length,
+        )
+        .order_by("show_time")
+        .values_list("show_time", "duration", "pk")
+    )
+    intervals = sorted(
+        [
+            (start, start + timedelta(minutes=minutes), pk)
+            for start, minutes, pk in existing
+        ]
+        + [(start, start + length, None) for start in show_times],
+        key=lambda interval: (interval[0], interval[2] is None),
+    )
+
+    # the interval ending last so far among existing and among new shows,
+    # any interval overlapping an earlier one overlaps one of these
+    last_existing = last_new = None
+    conflicts = []
+    for start, end, pk in intervals:
+        if pk is None:
+            if last_existing is not None and start < last_existing[1]:
+                conflicts.append((start, last_existing[2]))
+            elif last_new is not None and start < last_new[1]:
+                conflicts.append((start, None))
+            if last_new is None or end > last_new[1]:
+                last_new = (start, end)
+        else:
+            if last_new is not None and start < last_new[1]:
+                conflicts.append((last_new[0], pk))
+            if last_existing is None or end > last_existing[1]:
+                last_existing = (start, end, pk)
+    return sorted(set(conflicts), key=lambda conflict: conflict[0])
+
+
+def create_schedule(play, theatre_hall, show_times, duration):
+    """Create performances of ``play`` at ``show_times`` in one transaction
+
+    The hall row is locked while checking for overlaps, so concurrent
+    schedules of a hall can not double-book it.
+    """
+    with transaction.atomic():
+        TheatreHall.objects.select_for_update().get(pk=theatre_hall.pk)
+        conflicts = find_hall_conflicts(theatre_hall.pk, show_times, duration)
+        if conflicts:
+            raise HallDoubleBooked(conflicts)
+
+        return Performance.objects.bulk_create(
+            Performance(
+                play=play,
+                theatre_hall=theatre_hall,
+                show_time=show_time,
+                duration=duration,
+            )
+            for show_time in show_times
+        )
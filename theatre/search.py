@@ -0,0 +1,111 @@
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+from theatre.models import Play, PlaySearchDocument
+
+DOCUMENT_TABLE = PlaySearchDocument._meta.db_table
+
+SQLITE_FTS_TABLE = f"{DOCUMENT_TABLE}_fts"
+
+# bm25 weights of the title, description and actors columns
+SQLITE_RANK = f"bm25({SQLITE_FTS_TABLE}, 10.0, 1.0, 5.0)"
+
+# must match the expression of the GIN index created by the migrations
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', actors), 'B') || "
+    "setweight(to_tsvector('simple', description), 'C')"
+)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def refresh_search_documents(play_ids):
+    """Rebuild search documents of the given plays"""
+    plays = Play.objects.filter(pk__in=play_ids).prefetch_related("actors")
+    PlaySearchDocument.objects.bulk_create(
+        [
+            PlaySearchDocument(
+                play=play,
+                title=play.title,
+                description=play.description or "",
+                actors=" ".join(
+                    actor.full_name for actor in play.actors.all()
+                ),
+            )
+            for play in plays
+        ],
+        update_conflicts=True,
+        unique_fields=["play"],
+        update_fields=["title", "description", "actors"],
+    )
+
+
+def _sqlite_search(queryset, words, title_only):
+    match = " ".join(f'"{word}"*' for word in words)
+    if title_only:
+        match = f"title : ({match})"
+    play_id = f"{Play._meta.db_table}.{Play._meta.pk.column}"
+    return (
+        queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                [match],
+            )
+        )
+        .annotate(
+            search_rank=RawSQL(
+                f"SELECT -{SQLITE_RANK} FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {play_id}",
+                [match],
+            )
+        )
+        .order_by("-search_rank", "title")
+    )
+
+
+def _postgres_search(queryset, words, title_only):
+    weight = "A" if title_only else ""
+    tsquery = " & ".join(f"{word}:*{weight}" for word in words)
+    play_id = f"{Play._meta.db_table}.{Play._meta.pk.column}"
+    return (
+        queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT play_id FROM {DOCUMENT_TABLE} "
+                f"WHERE ({POSTGRES_VECTOR}) @@ to_tsquery('simple', %s)",
+                [tsquery],
+            )
+        )
+        .annotate(
+            search_rank=RawSQL(
+                f"SELECT ts_rank({POSTGRES_VECTOR}, "
+                f"to_tsquery('simple', %s)) FROM {DOCUMENT_TABLE} "
+                f"WHERE play_id = {play_id}",
+                [tsquery],
+            )
+        )
+        .order_by("-search_rank", "title")
+    )
+
+
+def search_plays(queryset, text, title_only=False):
+    """Filter plays by words of ``text`` through the full-text index
+
+    Every word has to match as a prefix of a word in the title, the
+    actor names or the description (only the title with
+    ``title_only``). Results are ordered by relevance.
+    """
+    words = WORD_RE.findall(text)
+    if not words:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        return _sqlite_search(queryset, words, title_only)
+    if vendor == "postgresql":
+        return _postgres_search(queryset, words, title_only)
+
+    return queryset.filter(title__icontains=text)
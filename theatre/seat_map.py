@@ -0,0 +1,472 @@
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from theatre.exceptions import SeatsTaken
+from theatre.metrics import SEAT_CONFLICTS
+from theatre.models import Performance, SeatHold, Ticket
+
+
+class SeatMap:
+    """Seat occupancy of a performance packed as rows x seats_in_row bits.
+
+    Bit ``(row - 1) * seats_in_row + (seat - 1)`` is set when the seat is
+    taken. Seats outside of the hall are never reported as taken, range
+    validation stays in ``Ticket.clean``.
+    """
+
+    def __init__(self, rows, seats_in_row, data=b""):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        size = (rows * seats_in_row + 7) // 8
+        self._bits = bytearray(bytes(data or b"")[:size].ljust(size, b"\0"))
+
+    @classmethod
+    def for_performance(cls, performance):
+        theatre_hall = performance.theatre_hall
+        return cls(
+            theatre_hall.rows,
+            theatre_hall.seats_in_row,
+            performance.seat_map,
+        )
+
+    def _position(self, row, seat):
+        if not (1 <= row <= self.rows and 1 <= seat <= self.seats_in_row):
+            return None
+        index = (row - 1) * self.seats_in_row + (seat - 1)
+        return index >> 3, 1 << (index & 7)
+
+    def is_taken(self, row, seat):
+        position = self._position(row, seat)
+        if position is None:
+            return False
+        byte, mask = position
+        return bool(self._bits[byte] & mask)
+
+    def take(self, row, seat):
+        """Mark the seat as taken, returns False if it already was"""
+        position = self._position(row, seat)
+        if position is None:
+            return False
+        byte, mask = position
+        if self._bits[byte] & mask:
+            return False
+        self._bits[byte] |= mask
+        return True
+
+    def release(self, row, seat):
+        """Mark the seat as free, returns False if it already was"""
+        position = self._position(row, seat)
+        if position is None:
+            return False
+        byte, mask = position
+        if not self._bits[byte] & mask:
+            return False
+        self._bits[byte] &= ~mask
+        return True
+
+    def taken_places(self):
+        places = []
+        for byte_index, byte in enumerate(self._bits):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    row, seat = divmod(byte_index * 8 + bit, self.seats_in_row)
+                    places.append((row + 1, seat + 1))
+        return places
+
+    def merge(self, data):
+        """Mark every seat set in another map's ``data`` as taken"""
+        for index, byte in enumerate(bytes(data)[: len(self._bits)]):
+            self._bits[index] |= byte
+
+    def __len__(self):
+        return sum(bin(byte).count("1") for byte in self._bits)
+
+    def to_bytes(self):
+        return bytes(self._bits)
+
+
+def _locked_performances(performance_ids):
+    # rows are always locked in primary key order, so concurrent
+    # multi-performance transactions can not deadlock
+    return (
+        Performance.objects.select_for_update(of=("self",))
+        .select_related("theatre_hall")
+        .filter(pk__in=performance_ids)
+        .order_by("pk")
+    )
+
+
+def _save_seat_map(performance, seat_map, sold_delta):
+    Performance.objects.filter(pk=performance.pk).update(
+        seat_map=seat_map.to_bytes(),
+        tickets_sold=F("tickets_sold") + sold_delta,
+        updated_at=timezone.now(),
+    )
+
+
+def _split_holds(performances, user_id):
+    """Split holds on locked performances into the user's own holds and
+    maps of seats held by other users, keyed by performance id
+    """
+    own_holds = []
+    held_maps = {}
+    now = timezone.now()
+    for hold in SeatHold.objects.filter(performance_id__in=performances):
+        if hold.user_id == user_id:
+            own_holds.append(hold)
+        elif hold.expires_at > now:
+            if hold.performance_id not in held_maps:
+                theatre_hall = performances[hold.performance_id].theatre_hall
+                held_maps[hold.performance_id] = SeatMap(
+                    theatre_hall.rows, theatre_hall.seats_in_row
+                )
+            held_maps[hold.performance_id].merge(hold.seats)
+    return own_holds, held_maps
+
+
+def held_places(performance):
+    """Return ``(row, seat)`` places under active holds of a performance"""
+    held_map = SeatMap(
+        performance.theatre_hall.rows, performance.theatre_hall.seats_in_row
+    )
+    for seats in SeatHold.objects.filter(
+        performance=performance, expires_at__gt=timezone.now()
+    ).values_list("seats", flat=True):
+        held_map.merge(seats)
+    return held_map.taken_places()
+
+
+def active_holds_count():
+    """Expression of the seats under unexpired holds of a performance"""
+    return Coalesce(
+        Subquery(
+            SeatHold.objects.filter(
+                performance=OuterRef("pk"), expires_at__gt=timezone.now()
+            )
+            .order_by()
+            .values("performance")
+            .annotate(seats=Sum("seats_count"))
+            .values("seats")
+        ),
+        Value(0),
+    )
+
+
+def taken_places(places):
+    """Return which ``(performance_id, row, seat)`` places have tickets"""
+    if not places:
+        return []
+    return list(
+        Ticket.objects.filter(
+            reduce(
+                or_,
+                (
+                    Q(performance_id=performance_id, row=row, seat=seat)
+                    for performance_id, row, seat in places
+                ),
+            )
+        ).values_list("performance_id", "row", "seat")
+    )
+
+
+def reserve_seats(tickets):
+    """Validate unsaved tickets and insert them with a single bulk_create
+
+    Performances are locked and loaded with their halls in one query, hall
+    ranges are checked in memory by ``Ticket.clean`` and every requested
+    place is looked up in the locked seat maps and in active holds of
+    other users, so all conflicts are reported at once with
+    ``SeatsTaken``. A unique constraint violation caused by a drifted seat
+    map is reported the same way. Holds of the reserving user on the
+    booked performances are released.
+
+    Must be called inside a transaction, the locks are held until it ends.
+    """
+    performances = {
+        performance.pk: performance
+        for performance in _locked_performances(
+            {ticket.performance_id for ticket in tickets}
+        )
+    }
+
+    missing = [ticket.performance_id not in performances for ticket in tickets]
+    if any(missing):
+        message = PrimaryKeyRelatedField.default_error_messages[
+            "does_not_exist"
+        ]
+        raise ValidationError(
+            {
+                "tickets": [
+                    {
+                        "performance": [
+                            message.format(pk_value=ticket.performance_id)
+                        ]
+                    }
+                    if is_missing
+                    else {}
+                    for ticket, is_missing in zip(tickets, missing)
+                ]
+            }
+        )
+
+    for ticket in tickets:
+        ticket.performance = performances[ticket.performance_id]
+        ticket.clean()
+
+    places = [
+        (ticket.performance_id, ticket.row, ticket.seat) for ticket in tickets
+    ]
+    for place, count in Counter(places).items():
+        if count > 1:
+            raise ValidationError(
+                {
+                    "tickets": f"Seat {place[2]} in row {place[1]} "
+                    f"is requested more than once"
+                }
+            )
+
+    own_holds, held_maps = _split_holds(
+        performances, tickets[0].reservation.user_id
+    )
+    seat_maps = {}
+    taken = []
+    for performance_id, row, seat in places:
+        if performance_id not in seat_maps:
+            seat_maps[performance_id] = SeatMap.for_performance(
+                performances[performance_id]
+            )
+        held_map = held_maps.get(performance_id)
+        if (
+            not seat_maps[performance_id].take(row, seat)
+            or held_map is not None and held_map.is_taken(row, seat)
+        ):
+            taken.append((performance_id, row, seat))
+    if taken:
+        SEAT_CONFLICTS.inc("reserve")
+        raise SeatsTaken(taken)
+
+    try:
+        with transaction.atomic():
+            tickets = Ticket.objects.bulk_create(tickets)
+    except IntegrityError:
+        taken = taken_places(places)
+        if not taken:
+            raise
+        SEAT_CONFLICTS.inc("reserve")
+        raise SeatsTaken(taken)
+
+    if own_holds:
+        SeatHold.objects.filter(
+            pk__in=[hold.pk for hold in own_holds]
+        ).delete()
+
+    for performance_id, seat_map in seat_maps.items():
+        _save_seat_map(
+            performances[performance_id],
+            seat_map,
+            sum(ticket.performance_id == performance_id for ticket in tickets),
+        )
+
+    return tickets
+
+
+def hold_seats(performance, user_id, places, minutes):
+    """Hold ``(row, seat)`` places of a performance for ``minutes``
+
+    A user keeps at most one hold per performance, a new hold replaces the
+    previous one. Seats sold or held by other users raise ``SeatsTaken``.
+    """
+    with transaction.atomic():
+        performance = _locked_performances([performance.pk]).get()
+        for row, seat in places:
+            Ticket(performance=performance, row=row, seat=seat).clean()
+        for (row, seat), count in Counter(places).items():
+            if count > 1:
+                raise ValidationError(
+                    {
+                        "seats": f"Seat {seat} in row {row} "
+                        f"is requested more than once"
+                    }
+                )
+
+        own_holds, held_maps = _split_holds(
+            {performance.pk: performance}, user_id
+        )
+        seat_map = SeatMap.for_performance(performance)
+        held_map = held_maps.get(performance.pk)
+        taken = [
+            (performance.pk, row, seat)
+            for row, seat in places
+            if seat_map.is_taken(row, seat)
+            or held_map is not None and held_map.is_taken(row, seat)
+        ]
+        if taken:
+            SEAT_CONFLICTS.inc("hold")
+            raise SeatsTaken(taken)
+
+        hold_map = SeatMap(
+            performance.theatre_hall.rows,
+            performance.theatre_hall.seats_in_row,
+        )
+        for row, seat in places:
+            hold_map.take(row, seat)
+
+        if own_holds:
+            SeatHold.objects.filter(
+                pk__in=[hold.pk for hold in own_holds]
+            ).delete()
+        hold = SeatHold.objects.create(
+            performance=performance,
+            user_id=user_id,
+            seats=hold_map.to_bytes(),
+            seats_count=len(places),
+            expires_at=timezone.now() + timedelta(minutes=minutes),
+        )
+        Performance.objects.filter(pk=performance.pk).update(
+            updated_at=timezone.now()
+        )
+    return hold
+
+
+def release_holds(performance, user_id):
+    """Drop the user's holds on a performance, returns if any existed"""
+    with transaction.atomic():
+        released, _ = SeatHold.objects.filter(
+            performance=performance, user_id=user_id
+        ).delete()
+        if not released:
+            return False
+        Performance.objects.filter(pk=performance.pk).update(
+            updated_at=timezone.now()
+        )
+    return True
+
+
+def expire_holds(batch_size=500):
+    """Delete expired holds in batches, returns the number of expired holds
+
+    Expired holds are already ignored by availability and seat checks,
+    sweeping only keeps the table small.
+    """
+    expired = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                SeatHold.objects.filter(expires_at__lte=timezone.now())
+                .values_list("pk", "performance_id")[:batch_size]
+            )
+            if not batch:
+                break
+            SeatHold.objects.filter(pk__in=[pk for pk, _ in batch]).delete()
+            Performance.objects.filter(
+                pk__in={performance_id for _, performance_id in batch}
+            ).update(updated_at=timezone.now())
+            expired += len(batch)
+    return expired
+
+
+def mark_seats(places, taken=True):
+    """Set (or clear) ``(performance_id, row, seat)`` places in seat maps
+
+    ``Performance.tickets_sold`` is adjusted in the same transaction, by
+    the number of seats taken, or by every released place since each one
+    is a deleted ticket, even a seat left outside of a shrunk hall.
+    """
+    seats_by_performance = defaultdict(list)
+    for performance_id, row, seat in places:
+        seats_by_performance[performance_id].append((row, seat))
+
+    if not seats_by_performance:
+        return
+
+    with transaction.atomic():
+        for performance in _locked_performances(seats_by_performance):
+            seat_map = SeatMap.for_performance(performance)
+            update = seat_map.take if taken else seat_map.release
+            places = seats_by_performance[performance.pk]
+            changed = sum(update(row, seat) for row, seat in places)
+            sold_delta = changed if taken else -len(places)
+            if sold_delta:
+                _save_seat_map(performance, seat_map, sold_delta)
+
+
+def rebuild_seat_maps(performance_ids=None):
+    """Recompute seat maps from tickets, returns the number of fixed maps"""
+    queryset = Performance.objects.order_by("pk")
+    if performance_ids is not None:
+        queryset = queryset.filter(pk__in=performance_ids)
+
+    fixed = 0
+    for performance_id in queryset.values_list("pk", flat=True).iterator():
+        with transaction.atomic():
+            performance = _locked_performances([performance_id]).first()
+            if performance is None:
+                continue
+            seat_map = SeatMap(
+                performance.theatre_hall.rows,
+                performance.theatre_hall.seats_in_row,
+            )
+            for row, seat in performance.tickets.values_list("row", "seat"):
+                seat_map.take(row, seat)
+            if seat_map.to_bytes() != bytes(performance.seat_map):
+                Performance.objects.filter(pk=performance.pk).update(
+                    seat_map=seat_map.to_bytes(), updated_at=timezone.now()
+                )
+                fixed += 1
+    return fixed
+
+
+def relayout_seat_maps(performance_ids):
+    """Re-pack seat maps of performances whose hall layout changed
+
+    Seat holds are packed with the old layout too, so they are released.
+    """
+    performance_ids = list(performance_ids)
+    SeatHold.objects.filter(performance_id__in=performance_ids).delete()
+    rebuild_seat_maps(performance_ids)
+    reconcile_tickets_sold(performance_ids)
+
+
+def reconcile_tickets_sold(performance_ids=None):
+    """Reset drifted ``tickets_sold`` counters
+
+    Returns the number of fixed performances.
+    """
+    sold = Coalesce(
+        Subquery(
+            Ticket.objects.filter(performance=OuterRef("pk"))
+            .order_by()
+            .values("performance")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        Value(0),
+    )
+    queryset = Performance.objects.all()
+    if performance_ids is not None:
+        queryset = queryset.filter(pk__in=performance_ids)
+
+    with transaction.atomic():
+        drifted = list(
+            queryset.order_by("pk")
+            .select_for_update()
+            .annotate(actual_sold=sold)
+            .exclude(tickets_sold=F("actual_sold"))
+            .values_list("pk", flat=True)
+        )
+        Performance.objects.filter(pk__in=drifted).update(
+            tickets_sold=sold, updated_at=timezone.now()
+        )
+    return len(drifted)
@@ -1,7 +1,15 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.db import transaction
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from theatre.fieldsets import SparseFieldsetMixin
+from theatre.metrics import RESERVATIONS_CREATED, TICKETS_CREATED
 from theatre.models import (
+    PERFORMANCE_MAX_MINUTES,
     Actor,
     Genre,
     Play,
@@ -9,36 +17,68 @@ from theatre.models import (
     Performance,
     Ticket,
     Reservation,
+    SeatHold,
+)
+from theatre.scheduling import create_schedule, recurring_show_times
+from theatre.seat_map import (
+    SeatMap,
+    held_places,
+    hold_seats,
+    reserve_seats,
 )
 
 
-class ActorSerializer(serializers.ModelSerializer):
+class ActorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Actor
         fields = ("id", "first_name", "last_name", "full_name")
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = "__all__"
 
 
-class TheatreHallSerializer(serializers.ModelSerializer):
+class TheatreHallSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = TheatreHall
         fields = ("id", "name", "rows", "seats_in_row", "capacity")
 
 
+@extend_schema_field(
+    {
+        "type": "object",
+        "additionalProperties": {"type": "string", "format": "uri"},
+    }
+)
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Urls of the resized copies of a play image by variant name"""
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        urls = {}
+        for name, path in value.items():
+            url = default_storage.url(path)
+            urls[name] = request.build_absolute_uri(url) if request else url
+        return urls
+
+
 class PlaySerializer(serializers.ModelSerializer):
     class Meta:
         model = Play
         fields = ("id", "title", "description", "genres", "actors")
 
 
-class PlayListSerializer(PlaySerializer):
+class PlayListSerializer(SparseFieldsetMixin, PlaySerializer):
     genres = serializers.StringRelatedField(many=True)
     actors = serializers.StringRelatedField(many=True)
+    image_variants = ImageVariantsField()
+
+    expandable_fields = {
+        "genres": partial(GenreSerializer, many=True, read_only=True),
+        "actors": partial(ActorSerializer, many=True, read_only=True),
+    }
 
     class Meta:
         model = Play
@@ -49,12 +89,14 @@ class PlayListSerializer(PlaySerializer):
             "genres",
             "actors",
             "image",
+            "image_variants",
         )
 
 
-class PlayDetailSerializer(PlaySerializer):
+class PlayDetailSerializer(SparseFieldsetMixin, PlaySerializer):
     genres = GenreSerializer(many=True, read_only=True)
     actors = ActorSerializer(many=True, read_only=True)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Play
@@ -65,6 +107,7 @@ class PlayDetailSerializer(PlaySerializer):
             "genres",
             "actors",
             "image",
+            "image_variants",
         )
 
 
@@ -77,10 +120,69 @@ class PlayImageSerializer(serializers.ModelSerializer):
 class PerformanceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Performance
-        fields = ("id", "show_time", "play", "theatre_hall")
+        fields = ("id", "show_time", "duration", "play", "theatre_hall")
+
+
+class PerformanceScheduleSerializer(serializers.Serializer):
+    play = serializers.PrimaryKeyRelatedField(queryset=Play.objects.all())
+    theatre_hall = serializers.PrimaryKeyRelatedField(
+        queryset=TheatreHall.objects.all()
+    )
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+        required=False,
+        help_text="Days of the week from Monday (0), every day by default",
+    )
+    times = serializers.ListField(
+        child=serializers.TimeField(), allow_empty=False
+    )
+    exclude_dates = serializers.ListField(
+        child=serializers.DateField(), default=list
+    )
+    duration = serializers.IntegerField(
+        min_value=1, max_value=PERFORMANCE_MAX_MINUTES, default=120
+    )
 
+    def validate(self, attrs):
+        if attrs["date_to"] < attrs["date_from"]:
+            raise serializers.ValidationError(
+                {"date_to": "Must not be before date_from."}
+            )
+
+        show_times = recurring_show_times(
+            attrs["date_from"],
+            attrs["date_to"],
+            attrs["times"],
+            attrs.get("weekdays"),
+            attrs["exclude_dates"],
+        )
+        if not show_times:
+            raise serializers.ValidationError(
+                "The schedule has no show times."
+            )
+        if len(show_times) > settings.SCHEDULE_MAX_PERFORMANCES:
+            raise serializers.ValidationError(
+                f"A schedule can not have more than "
+                f"{settings.SCHEDULE_MAX_PERFORMANCES} performances."
+            )
+        attrs["show_times"] = show_times
+        return attrs
 
-class PerformanceListSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        return create_schedule(
+            validated_data["play"],
+            validated_data["theatre_hall"],
+            validated_data["show_times"],
+            validated_data["duration"],
+        )
+
+
+class PerformanceListSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     play_title = serializers.CharField(source="play.title", read_only=True)
     theatre_hall_name = serializers.CharField(
         source="theatre_hall.name", read_only=True
@@ -90,6 +192,11 @@ class PerformanceListSerializer(serializers.ModelSerializer):
     )
     tickets_available = serializers.IntegerField(read_only=True)
 
+    expandable_fields = {
+        "play": partial(PlayListSerializer, read_only=True),
+        "theatre_hall": partial(TheatreHallSerializer, read_only=True),
+    }
+
     class Meta:
         model = Performance
         fields = (
@@ -103,12 +210,17 @@ class PerformanceListSerializer(serializers.ModelSerializer):
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    # performances are resolved in bulk by reserve_seats
+    performance = serializers.IntegerField(source="performance_id")
+
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "performance")
+        # seat availability is checked against the performance seat map
+        validators = []
 
 
-class TicketListSerializer(TicketSerializer):
+class TicketListSerializer(SparseFieldsetMixin, TicketSerializer):
     performance = PerformanceListSerializer(many=False, read_only=True)
 
 
@@ -118,16 +230,76 @@ class TicketTakenSeatsSerializer(TicketSerializer):
         fields = ("row", "seat")
 
 
-class PerformanceDetailSerializer(PerformanceSerializer):
+class PerformanceDetailSerializer(SparseFieldsetMixin, PerformanceSerializer):
     play = PlayListSerializer(many=False, read_only=True)
     theatre_hall = TheatreHallSerializer(many=False, read_only=True)
-    taken_places = TicketTakenSeatsSerializer(
-        source="tickets", many=True, read_only=True
-    )
+    taken_places = serializers.SerializerMethodField()
+    held_places = serializers.SerializerMethodField()
 
     class Meta:
         model = Performance
-        fields = ("id", "show_time", "play", "theatre_hall", "taken_places")
+        fields = (
+            "id",
+            "show_time",
+            "play",
+            "theatre_hall",
+            "taken_places",
+            "held_places",
+        )
+
+    @extend_schema_field(TicketTakenSeatsSerializer(many=True))
+    def get_taken_places(self, obj):
+        return [
+            {"row": row, "seat": seat}
+            for row, seat in SeatMap.for_performance(obj).taken_places()
+        ]
+
+    @extend_schema_field(TicketTakenSeatsSerializer(many=True))
+    def get_held_places(self, obj):
+        return [{"row": row, "seat": seat} for row, seat in held_places(obj)]
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    seats = TicketTakenSeatsSerializer(
+        many=True, allow_empty=False, write_only=True
+    )
+    minutes = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.SEAT_HOLD_MAX_MINUTES,
+        default=settings.SEAT_HOLD_MINUTES,
+        write_only=True,
+    )
+    held_places = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SeatHold
+        fields = (
+            "id",
+            "performance",
+            "seats",
+            "minutes",
+            "held_places",
+            "expires_at",
+        )
+        read_only_fields = ("performance", "expires_at")
+
+    @extend_schema_field(TicketTakenSeatsSerializer(many=True))
+    def get_held_places(self, obj):
+        theatre_hall = obj.performance.theatre_hall
+        seat_map = SeatMap(
+            theatre_hall.rows, theatre_hall.seats_in_row, obj.seats
+        )
+        return [
+            {"row": row, "seat": seat} for row, seat in seat_map.taken_places()
+        ]
+
+    def create(self, validated_data):
+        return hold_seats(
+            validated_data["performance"],
+            validated_data["user_id"],
+            [(seat["row"], seat["seat"]) for seat in validated_data["seats"]],
+            validated_data["minutes"],
+        )
 
 
 class ReservationSerializer(serializers.ModelSerializer):
@@ -141,10 +313,16 @@ class ReservationSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(reservation=reservation, **ticket_data)
-            return reservation
-
-
-class ReservationListSerializer(ReservationSerializer):
+            reserve_seats(
+                [
+                    Ticket(reservation=reservation, **ticket_data)
+                    for ticket_data in tickets_data
+                ]
+            )
+        RESERVATIONS_CREATED.inc()
+        TICKETS_CREATED.inc(amount=len(tickets_data))
+        return reservation
+
+
+class ReservationListSerializer(SparseFieldsetMixin, ReservationSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
@@ -0,0 +1,175 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from theatre.cache import bump_version, refresh_play_cards
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    TheatreHall,
+    Ticket,
+)
+from theatre.search import refresh_search_documents
+from theatre.seat_map import (
+    mark_seats,
+    rebuild_seat_maps,
+    reconcile_tickets_sold,
+    relayout_seat_maps,
+)
+
+
+def _previous_values(sender, instance, *fields):
+    """Return the stored values of ``fields``, None for new instances"""
+    if instance.pk is None:
+        return None
+    return sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_performance(sender, instance, **kwargs):
+    instance._previous_performance = _previous_values(
+        sender, instance, "performance_id"
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def take_ticket_seat(sender, instance, created, **kwargs):
+    if created:
+        mark_seats([(instance.performance_id, instance.row, instance.seat)])
+        return
+
+    performance_ids = {instance.performance_id}
+    if instance._previous_performance:
+        performance_ids.update(instance._previous_performance)
+    # a ticket moved to another performance frees its seat in the old one
+    rebuild_seat_maps(performance_ids)
+    if len(performance_ids) > 1:
+        reconcile_tickets_sold(performance_ids)
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, **kwargs):
+    mark_seats(
+        [(instance.performance_id, instance.row, instance.seat)],
+        taken=False,
+    )
+
+
+def plays_changed(play_ids, reindex=False):
+    """Mark plays as modified, refresh their cards and search documents"""
+    play_ids = list(play_ids)
+    Play.objects.filter(pk__in=play_ids).update(updated_at=timezone.now())
+    if reindex:
+        refresh_search_documents(play_ids)
+    transaction.on_commit(lambda: refresh_play_cards(play_ids))
+
+
+@receiver(post_save, sender=Play)
+def index_play(sender, instance, **kwargs):
+    play_ids = [instance.pk]
+    refresh_search_documents(play_ids)
+    transaction.on_commit(lambda: refresh_play_cards(play_ids))
+
+
+@receiver(post_delete, sender=Play)
+def drop_play_card(sender, instance, **kwargs):
+    play_ids = [instance.pk]
+    transaction.on_commit(lambda: refresh_play_cards(play_ids))
+
+
+@receiver(m2m_changed, sender=Play.actors.through)
+@receiver(m2m_changed, sender=Play.genres.through)
+def play_relations_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if reverse and action == "pre_clear":
+        instance._changed_play_ids = list(
+            instance.plays.values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        play_ids = [instance.pk]
+    elif action == "post_clear":
+        play_ids = instance._changed_play_ids
+    else:
+        play_ids = pk_set
+    plays_changed(play_ids, reindex=sender is Play.actors.through)
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=Genre)
+def play_relation_renamed(sender, instance, created, **kwargs):
+    if not created:
+        plays_changed(
+            list(instance.plays.values_list("pk", flat=True)),
+            reindex=sender is Actor,
+        )
+
+
+@receiver(pre_delete, sender=Actor)
+@receiver(pre_delete, sender=Genre)
+def remember_related_plays(sender, instance, **kwargs):
+    instance._changed_play_ids = list(
+        instance.plays.values_list("pk", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Actor)
+@receiver(post_delete, sender=Genre)
+def play_relation_deleted(sender, instance, **kwargs):
+    plays_changed(instance._changed_play_ids, reindex=sender is Actor)
+
+
+@receiver(pre_save, sender=TheatreHall)
+def remember_hall_layout(sender, instance, **kwargs):
+    instance._previous_layout = _previous_values(
+        sender, instance, "rows", "seats_in_row"
+    )
+
+
+@receiver(post_save, sender=TheatreHall)
+def theatre_hall_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    performances = Performance.objects.filter(theatre_hall=instance)
+    if instance._previous_layout != (instance.rows, instance.seats_in_row):
+        # seat bits are positioned by the hall layout
+        relayout_seat_maps(performances.values_list("pk", flat=True))
+    performances.update(updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=Performance)
+def remember_performance_hall(sender, instance, **kwargs):
+    instance._previous_hall = _previous_values(
+        sender, instance, "theatre_hall_id"
+    )
+
+
+@receiver(post_save, sender=Performance)
+def performance_hall_changed(sender, instance, created, **kwargs):
+    if not created and instance._previous_hall != (instance.theatre_hall_id,):
+        relayout_seat_maps([instance.pk])
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=TheatreHall)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Actor)
+@receiver(post_delete, sender=TheatreHall)
+def invalidate_cached_responses(sender, **kwargs):
+    # readers rebuilding the cache before commit would store old data
+    # under the new version
+    transaction.on_commit(lambda: bump_version(sender))
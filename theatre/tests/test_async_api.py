@@ -0,0 +1,158 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from user.authentication import ClaimsTokenObtainPairSerializer
+
+ASYNC_PLAY_URL = reverse("theatre:async-play-list")
+ASYNC_PERFORMANCE_URL = reverse("theatre:async-performance-list")
+ASYNC_RESERVATION_URL = reverse("theatre:async-reservation-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class AsyncReadApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = Play.objects.create(title="Hamlet")
+        self.play.genres.add(Genre.objects.create(name="Drama"))
+        self.play.actors.add(
+            Actor.objects.create(first_name="Anna", last_name="Smith")
+        )
+        self.performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=self.play,
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+            row=1,
+            seat=1,
+        )
+
+    def assertSameResponse(self, url, async_url, **params):
+        res = self.client.get(url, params)
+        async_res = self.client.get(async_url, params)
+
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json(), res.json())
+
+    def test_play_endpoints_match_sync_views(self):
+        self.assertSameResponse(
+            reverse("theatre:play-list"), ASYNC_PLAY_URL, actors="1"
+        )
+        self.assertSameResponse(
+            reverse("theatre:play-detail", args=[self.play.id]),
+            reverse("theatre:async-play-detail", args=[self.play.id]),
+        )
+
+    def test_performance_endpoints_match_sync_views(self):
+        self.assertSameResponse(
+            reverse("theatre:performance-list"),
+            ASYNC_PERFORMANCE_URL,
+            min_available=1,
+        )
+        self.assertSameResponse(
+            reverse("theatre:performance-detail", args=[self.performance.id]),
+            reverse(
+                "theatre:async-performance-detail",
+                args=[self.performance.id],
+            ),
+        )
+
+    def test_reservation_list_matches_sync_view(self):
+        self.assertSameResponse(
+            reverse("theatre:reservation-list"), ASYNC_RESERVATION_URL
+        )
+
+    def test_reservation_list_expand_matches_sync_view(self):
+        self.assertSameResponse(
+            reverse("theatre:reservation-list"),
+            ASYNC_RESERVATION_URL,
+            expand="tickets.performance.play",
+        )
+
+    def test_pages_match_sync_views(self):
+        for _ in range(2):
+            Performance.objects.create(
+                show_time="2022-06-03 14:00:00+00:00",
+                play=self.play,
+                theatre_hall=self.performance.theatre_hall,
+            )
+            Reservation.objects.create(user=self.user)
+
+        params = {"page": 2, "page_size": 2}
+        res = self.client.get(reverse("theatre:performance-list"), params)
+        async_res = self.client.get(ASYNC_PERFORMANCE_URL, params)
+        self.assertEqual(async_res.json()["count"], 3)
+        self.assertEqual(async_res.json()["results"], res.json()["results"])
+
+        first_page = self.client.get(ASYNC_RESERVATION_URL, {"page_size": 2})
+        res = self.client.get(
+            first_page.json()["next"].replace(
+                ASYNC_RESERVATION_URL, RESERVATION_URL
+            )
+        )
+        async_res = self.client.get(first_page.json()["next"])
+        self.assertEqual(len(async_res.json()["results"]), 1)
+        self.assertEqual(async_res.json()["results"], res.json()["results"])
+        self.assertIsNotNone(async_res.json()["previous"])
+
+    def test_page_out_of_range_not_found(self):
+        res = self.client.get(ASYNC_PERFORMANCE_URL, {"page": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_missing_play_not_found(self):
+        res = self.client.get(reverse("theatre:async-play-detail", args=[0]))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_conditional_get(self):
+        res = self.client.get(ASYNC_PLAY_URL)
+
+        res = self.client.get(ASYNC_PLAY_URL, HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_not_allowed(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.post(ASYNC_PLAY_URL, {"title": "Macbeth"})
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_served_by_async_handler(self):
+        client = AsyncClient()
+
+        res = await client.get(ASYNC_RESERVATION_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        token = await sync_to_async(
+            ClaimsTokenObtainPairSerializer.get_token
+        )(self.user)
+        res = await client.get(
+            ASYNC_RESERVATION_URL, AUTHORIZATION=f"Bearer {token.access_token}"
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()["results"]), 1)
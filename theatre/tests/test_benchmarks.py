@@ -0,0 +1,81 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from theatre.models import Performance, Play, Ticket
+
+SEED_OPTIONS = {
+    "plays": 20,
+    "performances": 40,
+    "tickets": 400,
+    "users": 5,
+    "stdout": StringIO(),
+}
+
+
+class SeedTheatreTests(TestCase):
+    def test_seeded_data_is_consistent(self):
+        call_command("seed_theatre", **SEED_OPTIONS)
+
+        self.assertEqual(Play.objects.count(), 20)
+        self.assertEqual(Performance.objects.count(), 40)
+        self.assertEqual(
+            sum(Performance.objects.values_list("tickets_sold", flat=True)),
+            Ticket.objects.count(),
+        )
+
+        out = StringIO()
+        call_command("rebuild_seat_maps", stdout=out)
+        self.assertIn("0 fixed", out.getvalue())
+
+    def test_equal_seeds_give_equal_data(self):
+        call_command("seed_theatre", **SEED_OPTIONS)
+        plays = list(
+            Play.objects.order_by("title", "genres__name").values_list(
+                "title", "genres__name"
+            )
+        )
+
+        call_command("seed_theatre", clear=True, **SEED_OPTIONS)
+
+        self.assertEqual(
+            list(
+                Play.objects.order_by("title", "genres__name").values_list(
+                    "title", "genres__name"
+                )
+            ),
+            plays,
+        )
+
+    def test_existing_data_not_overwritten(self):
+        Play.objects.create(title="Play")
+
+        with self.assertRaises(CommandError):
+            call_command("seed_theatre", **SEED_OPTIONS)
+
+
+class BenchmarkApiTests(TestCase):
+    def setUp(self):
+        call_command("seed_theatre", **SEED_OPTIONS)
+
+    def test_query_budgets_met(self):
+        out = StringIO()
+
+        call_command("benchmark_api", requests=2, warmup=1, stdout=out)
+
+        self.assertIn("All query budgets met.", out.getvalue())
+
+    def test_exceeded_budget_fails(self):
+        with mock.patch.dict(
+            "theatre.benchmarks.QUERY_BUDGETS", {"play-list": 1}
+        ):
+            with self.assertRaisesMessage(CommandError, "play-list ran"):
+                call_command(
+                    "benchmark_api",
+                    requests=1,
+                    warmup=0,
+                    endpoint=["play-list"],
+                    stdout=StringIO(),
+                )
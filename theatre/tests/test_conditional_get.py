@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import (
+    Actor,
+    Play,
+    Performance,
+    Reservation,
+    SeatHold,
+    TheatreHall,
+    Ticket,
+)
+
+PLAY_URL = reverse("theatre:play-list")
+
+
+def play_detail_url(play_id):
+    return reverse("theatre:play-detail", args=[play_id])
+
+
+def performance_detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = Play.objects.create(title="Play")
+        self.actor = Actor.objects.create(first_name="Jon", last_name="Doe")
+        self.play.actors.add(self.actor)
+        self.performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=self.play,
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+
+    def assert_not_modified(self, url):
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", res)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        return res["ETag"]
+
+    def test_play_detail_not_modified(self):
+        etag = self.assert_not_modified(play_detail_url(self.play.id))
+
+        self.actor.first_name = "John"
+        self.actor.save()
+        res = self.client.get(
+            play_detail_url(self.play.id), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_play_list_not_modified(self):
+        etag = self.assert_not_modified(PLAY_URL)
+
+        Play.objects.create(title="Another play")
+        res = self.client.get(PLAY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_fieldset_changes_etag(self):
+        url = play_detail_url(self.play.id)
+        etag = self.assert_not_modified(url)
+
+        res = self.client.get(url, {"fields": "id"}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"id": self.play.id})
+        self.assert_not_modified(f"{url}?fields=id")
+
+    def test_performance_detail_changes_with_tickets(self):
+        url = performance_detail_url(self.performance.id)
+        etag = self.assert_not_modified(url)
+
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+            row=1,
+            seat=1,
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_performance_detail_changes_when_hold_expires(self):
+        url = performance_detail_url(self.performance.id)
+        self.client.post(
+            reverse("theatre:performance-hold", args=[self.performance.id]),
+            {"seats": [{"row": 1, "seat": 1}]},
+            format="json",
+        )
+        etag = self.assert_not_modified(url)
+
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["held_places"], [])
+
+    def test_missing_play_is_not_found(self):
+        res = self.client.get(play_detail_url(self.play.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
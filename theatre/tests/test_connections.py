@@ -0,0 +1,86 @@
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from theatre_service.metrics import read_values
+from theatre_service.postgres.base import (
+    POOL_EVENTS,
+    DatabaseWrapper,
+    pool_stats,
+)
+
+
+def postgres_wrapper():
+    return DatabaseWrapper(
+        {
+            "ENGINE": "theatre_service.postgres",
+            "NAME": "theatre",
+            "USER": "",
+            "PASSWORD": "",
+            "HOST": "",
+            "PORT": "",
+            "ATOMIC_REQUESTS": False,
+            "AUTOCOMMIT": True,
+            "CONN_MAX_AGE": 300,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+            "TIME_ZONE": None,
+            "TEST": {},
+        },
+        alias="postgres-test",
+    )
+
+
+@mock.patch.object(DatabaseWrapper, "init_connection_state", mock.Mock())
+@mock.patch.object(DatabaseWrapper, "get_new_connection")
+class PostgresPoolStatsTests(SimpleTestCase):
+    def test_reused_connection_counted_as_hit(self, get_new_connection):
+        wrapper = postgres_wrapper()
+        before = pool_stats()
+
+        for _ in range(3):
+            wrapper.close_if_unusable_or_obsolete()
+            wrapper.ensure_connection()
+
+        stats = pool_stats()
+        self.assertEqual(stats["misses"] - before["misses"], 1)
+        self.assertEqual(stats["hits"] - before["hits"], 2)
+        self.assertEqual(get_new_connection.call_count, 1)
+
+    def test_failed_health_check_reconnects(self, get_new_connection):
+        wrapper = postgres_wrapper()
+        wrapper.ensure_connection()
+        before = pool_stats()
+
+        wrapper.close_if_unusable_or_obsolete()
+        with mock.patch.object(wrapper, "is_usable", return_value=False):
+            wrapper.close_if_health_check_failed()
+        wrapper.ensure_connection()
+
+        stats = pool_stats()
+        self.assertEqual(
+            stats["health_check_failures"] - before["health_check_failures"],
+            1,
+        )
+        self.assertEqual(stats["misses"] - before["misses"], 1)
+        self.assertEqual(stats["hits"], before["hits"])
+
+    def test_events_exported_as_metrics(self, get_new_connection):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        wrapper = postgres_wrapper()
+
+        with override_settings(METRICS_DIR=directory.name):
+            for _ in range(3):
+                wrapper.close_if_unusable_or_obsolete()
+                wrapper.ensure_connection()
+            values = read_values()
+
+        self.assertEqual(
+            values[(POOL_EVENTS.name, "postgres-test", "misses")], [1]
+        )
+        self.assertEqual(
+            values[(POOL_EVENTS.name, "postgres-test", "hits")], [2]
+        )
+
@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Play, Performance, TheatreHall
+from theatre_service.db_router import (
+    PIN_COOKIE,
+    PrimaryReplicaRouter,
+    primary_pinning_middleware,
+)
+
+router = PrimaryReplicaRouter()
+
+
+def route(request, write=False):
+    """Run a request through the middleware, returning its read alias"""
+    aliases = []
+
+    def view(request):
+        if write:
+            router.db_for_write(Play)
+        aliases.append(router.db_for_read(Play))
+        return HttpResponse()
+
+    response = primary_pinning_middleware(view)(request)
+    return aliases[0], response
+
+
+@override_settings(DATABASE_PRIMARY="default", DATABASE_REPLICAS=["replica"])
+class PrimaryReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_safe_requests_read_from_replica(self):
+        alias, response = route(self.factory.get("/"))
+
+        self.assertEqual(alias, "replica")
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_unsafe_requests_read_from_primary(self):
+        alias, _ = route(self.factory.post("/"))
+
+        self.assertEqual(alias, "default")
+
+    def test_writes_pin_client_to_primary(self):
+        alias, response = route(self.factory.get("/"), write=True)
+
+        self.assertEqual(alias, "default")
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        request = self.factory.get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+        alias, _ = route(request)
+
+        self.assertEqual(alias, "default")
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Play), "default")
+        self.assertEqual(router.db_for_write(Play), "default")
+
+
+class ReservationPinningTests(TestCase):
+    def test_reservation_pins_client_to_primary(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "password")
+        )
+        performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=Play.objects.create(title="Play"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+
+        res = client.post(
+            reverse("theatre:reservation-list"),
+            {"tickets": [{"row": 1, "seat": 1, "performance": performance.id}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn(PIN_COOKIE, res.cookies)
@@ -0,0 +1,94 @@
+import csv
+import json
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, Reservation, TheatreHall, Ticket
+
+EXPORT_URL = reverse("theatre:reservation-export")
+
+
+class ReservationExportTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        performance = Performance.objects.create(
+            show_time="2024-06-02 14:00:00+00:00",
+            play=Play.objects.create(title="Hamlet"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+        for day, seats in ((1, (1, 2)), (10, (3,))):
+            reservation = Reservation.objects.create(user=self.user)
+            Reservation.objects.filter(pk=reservation.pk).update(
+                created_at=datetime(2024, 5, day, 12, tzinfo=timezone.utc)
+            )
+            for seat in seats:
+                Ticket.objects.create(
+                    performance=performance,
+                    reservation=reservation,
+                    row=1,
+                    seat=seat,
+                )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@test.com", "password", is_staff=True
+            )
+        )
+
+    def test_ndjson_export(self):
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in b"".join(res.streaming_content).splitlines()
+        ]
+        self.assertEqual([row["seat"] for row in rows], [1, 2, 3])
+        self.assertEqual(rows[0]["play_title"], "Hamlet")
+        self.assertEqual(rows[0]["theatre_hall_name"], "Blue")
+        self.assertEqual(rows[0]["user_email"], "test@test.com")
+
+    def test_csv_export_filtered_by_date(self):
+        res = self.client.get(
+            EXPORT_URL, {"output": "csv", "date_to": "2024-05-01"}
+        )
+
+        content = b"".join(res.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([row["seat"] for row in rows], ["1", "2"])
+        self.assertEqual(rows[0]["show_time"], "2024-06-02T14:00:00+00:00")
+
+    def test_invalid_output_rejected(self):
+        res = self.client.get(EXPORT_URL, {"output": "xml"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_staff_only(self):
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command("export_reservations", date_from="2024-05-05", stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["seat"] for row in rows], [3])
+
+        with self.assertRaises(CommandError):
+            call_command("export_reservations", date_from="May")
@@ -0,0 +1,169 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.fieldsets import parse_fieldset
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+PLAY_URL = reverse("theatre:play-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class ParseFieldsetTests(TestCase):
+    def test_nested_names(self):
+        self.assertEqual(
+            parse_fieldset("id, tickets.row,tickets.performance.play_title"),
+            {
+                "id": {},
+                "tickets": {"row": {}, "performance": {"play_title": {}}},
+            },
+        )
+
+
+class SparseFieldsetApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.play = Play.objects.create(title="Hamlet", description="Prince")
+        self.play.genres.add(Genre.objects.create(name="Drama"))
+        self.play.actors.add(
+            Actor.objects.create(first_name="Anna", last_name="Moroz")
+        )
+        self.performance = Performance.objects.create(
+            show_time="2024-06-02 14:00:00+00:00",
+            play=self.play,
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=reservation,
+            row=1,
+            seat=1,
+        )
+
+    def test_play_list_cards_trimmed(self):
+        res = self.client.get(PLAY_URL, {"fields": "id,title"})
+
+        self.assertEqual(res.data, [{"id": self.play.id, "title": "Hamlet"}])
+
+    def test_play_list_expand(self):
+        res = self.client.get(
+            PLAY_URL, {"fields": "title,genres", "expand": "genres"}
+        )
+
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "title": "Hamlet",
+                    "genres": [
+                        {"id": self.play.genres.get().id, "name": "Drama"}
+                    ],
+                }
+            ],
+        )
+
+    def test_play_detail_skips_unused_relations(self):
+        url = reverse("theatre:play-detail", args=[self.play.id])
+
+        with self.assertNumQueries(2):
+            res = self.client.get(url, {"fields": "id,title"})
+
+        self.assertEqual(res.data, {"id": self.play.id, "title": "Hamlet"})
+
+    def test_unknown_field_rejected(self):
+        for url in (PLAY_URL, PERFORMANCE_URL, RESERVATION_URL):
+            res = self.client.get(url, {"fields": "id,price"})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(res.data, {"fields": "Unknown fields: price."})
+
+    def test_performance_list_without_joins(self):
+        with self.assertNumQueries(2):
+            res = self.client.get(PERFORMANCE_URL, {"fields": "id,show_time"})
+
+        self.assertEqual(
+            res.data["results"],
+            [
+                {
+                    "id": self.performance.id,
+                    "show_time": "2024-06-02T17:00:00+03:00",
+                }
+            ],
+        )
+
+    def test_performance_list_expand_play(self):
+        res = self.client.get(
+            PERFORMANCE_URL,
+            {"fields": "id,play.title,play.actors", "expand": "play"},
+        )
+
+        self.assertEqual(
+            res.data["results"][0]["play"],
+            {"title": "Hamlet", "actors": ["Anna Moroz"]},
+        )
+
+    def test_reservation_list_nested_fields(self):
+        with self.assertNumQueries(4):
+            res = self.client.get(
+                RESERVATION_URL,
+                {"fields": "id,tickets.seat,tickets.performance.play_title"},
+            )
+
+        self.assertEqual(
+            res.data["results"][0]["tickets"],
+            [{"seat": 1, "performance": {"play_title": "Hamlet"}}],
+        )
+
+    def test_reservation_list_expand_play_prefetched(self):
+        reservation = Reservation.objects.get()
+        for seat in range(2, 6):
+            play = Play.objects.create(title=f"Play {seat}")
+            play.genres.add(Genre.objects.create(name=f"Genre {seat}"))
+            Ticket.objects.create(
+                performance=Performance.objects.create(
+                    show_time="2024-06-03 14:00:00+00:00",
+                    play=play,
+                    theatre_hall=self.performance.theatre_hall,
+                ),
+                reservation=reservation,
+                row=1,
+                seat=seat,
+            )
+
+        # reservations, tickets, performances, plays, halls, genres, actors
+        with self.assertNumQueries(7):
+            res = self.client.get(
+                RESERVATION_URL, {"expand": "tickets.performance.play"}
+            )
+
+        tickets = res.data["results"][0]["tickets"]
+        self.assertEqual(len(tickets), 5)
+        self.assertEqual(
+            tickets[0]["performance"]["play"]["genres"], ["Drama"]
+        )
+
+    def test_reservation_list_without_tickets(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(RESERVATION_URL, {"fields": "id"})
+
+        self.assertEqual(len(res.data["results"][0]), 1)
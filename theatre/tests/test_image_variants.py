@@ -0,0 +1,92 @@
+import os
+import tempfile
+from io import StringIO
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Play
+
+PLAY_URL = reverse("theatre:play-list")
+
+
+def image_upload_url(play_id):
+    return reverse("theatre:play-upload-image", args=[play_id])
+
+
+class PlayImageVariantsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@myproject.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = Play.objects.create(title="Play")
+
+    def tearDown(self):
+        self.play.refresh_from_db()
+        for path in self.play.image_variants.values():
+            default_storage.delete(path)
+        self.play.image.delete()
+
+    def upload_image(self, commit=True):
+        with tempfile.NamedTemporaryFile(suffix=".png") as ntf:
+            Image.new("RGBA", (1000, 500)).save(ntf, format="PNG")
+            ntf.seek(0)
+            with self.captureOnCommitCallbacks(execute=commit):
+                return self.client.post(
+                    image_upload_url(self.play.id),
+                    {"image": ntf},
+                    format="multipart",
+                )
+
+    def test_upload_renders_variants_after_commit(self):
+        res = self.upload_image()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.play.refresh_from_db()
+        self.assertEqual(
+            set(self.play.image_variants),
+            {"thumbnail", "thumbnail_webp", "webp"},
+        )
+        with default_storage.open(
+            self.play.image_variants["thumbnail_webp"]
+        ) as variant:
+            image = Image.open(variant)
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (320, 160))
+
+        res = self.client.get(PLAY_URL)
+
+        self.assertTrue(
+            res.data[0]["image_variants"]["thumbnail"].startswith("http")
+        )
+
+    def test_replaced_image_variants_removed(self):
+        self.upload_image()
+        self.play.refresh_from_db()
+        old_variants = self.play.image_variants
+        old_image = self.play.image.path
+
+        self.upload_image()
+
+        os.remove(old_image)
+        for path in old_variants.values():
+            self.assertFalse(default_storage.exists(path))
+
+    def test_backfill_command(self):
+        self.upload_image(commit=False)
+        self.play.refresh_from_db()
+        self.assertEqual(self.play.image_variants, {})
+
+        call_command("generate_image_variants", stdout=StringIO())
+
+        self.play.refresh_from_db()
+        self.assertEqual(len(self.play.image_variants), 3)
@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+
+class ImportCatalogTests(TestCase):
+    def write(self, name, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def run_import(self, kind, path, **options):
+        out = StringIO()
+        call_command(
+            "import_catalog", kind, path, batch_size=2, stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_plays_csv_upserted(self):
+        Genre.objects.create(name="Drama")
+        path = self.write(
+            "plays.csv",
+            "title,description,genres,actors\n"
+            "Hamlet,Prince,Drama|Tragedy,Anna Moroz|Taras Franko\n"
+            "Macbeth,,Tragedy,Anna Moroz\n"
+            "Nora,A doll's house,,\n",
+        )
+
+        out = self.run_import("plays", path)
+
+        self.assertIn("3 created, 0 updated", out)
+        hamlet = Play.objects.get(title="Hamlet")
+        self.assertEqual(
+            sorted(hamlet.genres.values_list("name", flat=True)),
+            ["Drama", "Tragedy"],
+        )
+        self.assertEqual(Actor.objects.count(), 2)
+        self.assertEqual(Genre.objects.count(), 2)
+        self.assertIn("Taras Franko", hamlet.search_document.actors)
+
+        path = self.write(
+            "plays.jsonl",
+            json.dumps(
+                {
+                    "title": "Hamlet",
+                    "description": "Prince of Denmark",
+                    "genres": ["Drama"],
+                    "actors": [],
+                }
+            ),
+        )
+        out = self.run_import("plays", path)
+
+        self.assertIn("0 created, 1 updated", out)
+        hamlet.refresh_from_db()
+        self.assertEqual(hamlet.description, "Prince of Denmark")
+        self.assertEqual(
+            list(hamlet.genres.values_list("name", flat=True)), ["Drama"]
+        )
+        self.assertFalse(hamlet.actors.exists())
+
+    def test_performances_imported_once(self):
+        Play.objects.create(title="Hamlet")
+        TheatreHall.objects.create(name="Blue", rows=5, seats_in_row=5)
+        path = self.write(
+            "performances.jsonl",
+            "\n".join(
+                json.dumps(
+                    {
+                        "play": "Hamlet",
+                        "theatre_hall": "Blue",
+                        "show_time": f"2024-06-0{day}T19:00:00+00:00",
+                    }
+                )
+                for day in range(1, 4)
+            ),
+        )
+
+        self.assertIn("3 created", self.run_import("performances", path))
+        self.assertIn(
+            "0 created, 0 updated, 3 unchanged",
+            self.run_import("performances", path),
+        )
+        self.assertEqual(Performance.objects.count(), 3)
+
+    def test_dry_run_saves_nothing(self):
+        path = self.write("genres.csv", "name\nDrama\nComedy\nOpera\n")
+
+        out = self.run_import("genres", path, dry_run=True)
+
+        self.assertIn("Dry run, nothing saved: 3 created", out)
+        self.assertFalse(Genre.objects.exists())
+
+    def test_invalid_record_reports_line(self):
+        path = self.write(
+            "performances.csv",
+            "play,theatre_hall,show_time\nHamlet,Red,2024-06-01 19:00\n",
+        )
+
+        with self.assertRaisesMessage(CommandError, "Line 2: unknown hall"):
+            self.run_import("performances", path)
@@ -0,0 +1,54 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from theatre.models import Play
+
+PLAY_URL = reverse("theatre:play-list")
+
+LOGGER = "theatre_service.instrumentation"
+
+
+@override_settings(REQUEST_INSTRUMENTATION=True, SLOW_REQUEST_MS=60_000)
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "password")
+        )
+        Play.objects.create(title="Hamlet")
+
+    def test_server_timing_header(self):
+        with self.assertLogs(LOGGER, "INFO") as logs:
+            res = self.client.get(PLAY_URL)
+
+        self.assertRegex(
+            res["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", '
+            r"serializer;dur=[\d.]+, total;dur=[\d.]+$",
+        )
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["route"], "theatre:play-list")
+        self.assertGreater(record["queries"], 0)
+        self.assertGreater(record["serializer_ms"], 0)
+        self.assertNotIn("sql", record)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_logged_with_sql(self):
+        with self.assertLogs(LOGGER, "WARNING") as logs:
+            self.client.get(PLAY_URL)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(len(record["sql"]), record["queries"])
+        self.assertIn("theatre_play", record["sql"][-1]["sql"])
+
+
+class InstrumentationDisabledTests(TestCase):
+    def test_no_server_timing_header(self):
+        res = APIClient().get(PLAY_URL)
+
+        self.assertNotIn("Server-Timing", res)
@@ -0,0 +1,135 @@
+import multiprocessing
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.metrics import SEAT_CONFLICTS
+from theatre.models import Performance, Play, TheatreHall
+from theatre_service.metrics import REGISTRY, Histogram, read_values
+
+METRICS_URL = reverse("metrics")
+PLAY_URL = reverse("theatre:play-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def _record_conflict():
+    SEAT_CONFLICTS.inc("hold")
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(METRICS_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "password")
+        )
+        self.performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=Play.objects.create(title="Play"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+
+    def reserve(self, *places):
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {
+                        "row": row,
+                        "seat": seat,
+                        "performance": self.performance.id,
+                    }
+                    for row, seat in places
+                ]
+            },
+            format="json",
+        )
+
+    def test_request_latency_by_route(self):
+        self.client.get(PLAY_URL)
+        self.client.get(PLAY_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        body = res.content.decode()
+        self.assertIn(
+            'http_request_duration_seconds_count{route="theatre:play-list",'
+            'method="GET"} 2',
+            body,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="theatre:play-list",'
+            'method="GET",le="+Inf"} 2',
+            body,
+        )
+        self.assertIn(
+            'db_query_duration_seconds_count{database="default"}', body
+        )
+
+    def test_reservation_counters(self):
+        self.assertEqual(self.reserve((1, 1), (1, 2)).status_code, 201)
+        self.assertEqual(self.reserve((1, 2)).status_code, 409)
+
+        body = self.client.get(METRICS_URL).content.decode()
+
+        self.assertIn("theatre_reservations_created_total 1\n", body)
+        self.assertIn("theatre_tickets_created_total 2\n", body)
+        self.assertIn(
+            'theatre_seat_conflicts_total{operation="reserve"} 1\n', body
+        )
+
+    def test_values_summed_across_processes(self):
+        SEAT_CONFLICTS.inc("hold")
+        process = multiprocessing.get_context("fork").Process(
+            target=_record_conflict
+        )
+        process.start()
+        process.join()
+
+        self.assertEqual(read_values()[(SEAT_CONFLICTS.name, "hold")], [2])
+
+    def test_histogram_buckets(self):
+        histogram = Histogram("test_seconds", "Test.", buckets=(1, 2))
+        self.addCleanup(
+            REGISTRY.remove,
+            histogram,
+        )
+        for value in (0.5, 1, 1.5, 3):
+            histogram.observe(value)
+
+        self.assertEqual(read_values()[("test_seconds",)], [2, 1, 1, 6, 4])
+
+    def test_large_values_keep_precision(self):
+        SEAT_CONFLICTS.inc("hold", amount=1234567)
+        histogram = Histogram("test_seconds", "Test.", buckets=(1,))
+        self.addCleanup(REGISTRY.remove, histogram)
+        histogram.observe(0.123456789)
+
+        body = self.client.get(METRICS_URL).content.decode()
+
+        self.assertIn(
+            'theatre_seat_conflicts_total{operation="hold"} 1234567\n', body
+        )
+        self.assertIn("test_seconds_sum 0.123456789\n", body)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token_required(self):
+        client = APIClient()
+
+        self.assertEqual(client.get(METRICS_URL).status_code, 401)
+        client.credentials(HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(client.get(METRICS_URL).status_code, 200)
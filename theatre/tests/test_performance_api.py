@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Play, Performance, TheatreHall
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+
+
+class PerformanceListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = Play.objects.create(title="Play")
+        self.other_play = Play.objects.create(title="Other play")
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        self.small_hall = TheatreHall.objects.create(
+            name="Small", rows=2, seats_in_row=2
+        )
+        self.september = Performance.objects.create(
+            show_time="2023-09-10 19:00:00+00:00",
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+        )
+        self.october = Performance.objects.create(
+            show_time="2023-10-01 19:00:00+00:00",
+            play=self.other_play,
+            theatre_hall=self.small_hall,
+        )
+
+    def list_ids(self, **params):
+        res = self.client.get(PERFORMANCE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [performance["id"] for performance in res.data["results"]]
+
+    def test_list_is_paginated(self):
+        res = self.client.get(PERFORMANCE_URL, {"page_size": 1})
+
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_filter_by_date_range(self):
+        self.assertEqual(
+            self.list_ids(date_from="2023-09-01", date_to="2023-09-30"),
+            [self.september.id],
+        )
+        self.assertEqual(
+            self.list_ids(date_to="2023-10-01"),
+            [self.september.id, self.october.id],
+        )
+
+    def test_filter_by_play_and_theatre_hall(self):
+        self.assertEqual(
+            self.list_ids(play=self.other_play.id), [self.october.id]
+        )
+        self.assertEqual(
+            self.list_ids(theatre_hall=self.theatre_hall.id),
+            [self.september.id],
+        )
+
+    def test_filter_by_available_seats(self):
+        Performance.objects.filter(pk=self.september.pk).update(
+            tickets_sold=95
+        )
+
+        self.assertEqual(self.list_ids(min_available=5), [self.september.id])
+        self.assertEqual(self.list_ids(min_available=6), [])
+
+    def test_invalid_filter_rejected(self):
+        res = self.client.get(PERFORMANCE_URL, {"date_from": "soon"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,168 @@
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, TheatreHall
+from theatre.scheduling import find_hall_conflicts, recurring_show_times
+
+SCHEDULE_URL = reverse("theatre:performance-schedule")
+
+
+def local(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+
+class RecurringShowTimesTests(TestCase):
+    def test_weekdays_times_and_exclusions(self):
+        show_times = recurring_show_times(
+            date(2024, 6, 3),
+            date(2024, 6, 16),
+            [time(19), time(14)],
+            weekdays=[4, 5],
+            exclude_dates=[date(2024, 6, 8)],
+        )
+
+        self.assertEqual(
+            show_times,
+            [
+                local(date(2024, 6, 7), 14),
+                local(date(2024, 6, 7), 19),
+                local(date(2024, 6, 14), 14),
+                local(date(2024, 6, 14), 19),
+                local(date(2024, 6, 15), 14),
+                local(date(2024, 6, 15), 19),
+            ],
+        )
+
+
+class HallConflictTests(TestCase):
+    def setUp(self):
+        self.play = Play.objects.create(title="Hamlet")
+        self.hall = TheatreHall.objects.create(
+            name="Blue", rows=5, seats_in_row=5
+        )
+
+    def test_overlaps_with_existing_and_new_shows(self):
+        day = date(2024, 6, 3)
+        long_show = Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.hall,
+            show_time=local(day, 10),
+            duration=300,
+        )
+        Performance.objects.create(
+            play=self.play, theatre_hall=self.hall, show_time=local(day, 16)
+        )
+        Performance.objects.create(
+            play=self.play,
+            theatre_hall=TheatreHall.objects.create(
+                name="Red", rows=5, seats_in_row=5
+            ),
+            show_time=local(day, 19),
+        )
+
+        with self.assertNumQueries(1):
+            conflicts = find_hall_conflicts(
+                self.hall.pk,
+                [local(day, 14), local(day, 18), local(day, 18, 30)],
+                60,
+            )
+
+        self.assertEqual(
+            conflicts,
+            [(local(day, 14), long_show.pk), (local(day, 18, 30), None)],
+        )
+
+    def test_back_to_back_shows_allowed(self):
+        day = date(2024, 6, 3)
+        Performance.objects.create(
+            play=self.play,
+            theatre_hall=self.hall,
+            show_time=local(day, 12),
+            duration=120,
+        )
+
+        self.assertEqual(
+            find_hall_conflicts(
+                self.hall.pk, [local(day, 10), local(day, 14)], 120
+            ),
+            [],
+        )
+
+
+class PerformanceScheduleApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@test.com", "password", is_staff=True
+            )
+        )
+        self.play = Play.objects.create(title="Hamlet")
+        self.hall = TheatreHall.objects.create(
+            name="Blue", rows=5, seats_in_row=5
+        )
+        self.payload = {
+            "play": self.play.id,
+            "theatre_hall": self.hall.id,
+            "date_from": "2024-06-01",
+            "date_to": "2024-08-31",
+            "times": ["19:00"],
+            "exclude_dates": ["2024-07-04"],
+            "duration": 150,
+        }
+
+    def test_nightly_run_created_in_one_request(self):
+        with self.assertNumQueries(7):
+            res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 91)
+        self.assertEqual(Performance.objects.count(), 91)
+        self.assertEqual(
+            set(Performance.objects.values_list("duration", flat=True)),
+            {150},
+        )
+
+    def test_double_booking_rejected(self):
+        existing = Performance.objects.create(
+            play=Play.objects.create(title="Macbeth"),
+            theatre_hall=self.hall,
+            show_time=local(date(2024, 7, 10), 20),
+        )
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["conflicts"],
+            [
+                {
+                    "show_time": local(date(2024, 7, 10), 19),
+                    "performance": existing.pk,
+                }
+            ],
+        )
+        self.assertEqual(Performance.objects.count(), 1)
+
+    def test_schedule_size_limited(self):
+        self.payload["date_to"] = str(date(2024, 6, 1) + timedelta(days=1100))
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_schedule_admin_only(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "password")
+        )
+
+        res = self.client.post(SCHEDULE_URL, self.payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,123 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from theatre.cache import get_play_cards, refresh_play_cards
+from theatre.models import Actor, Genre, Play
+from theatre.serializers import PlayListSerializer
+
+PLAY_URL = reverse("theatre:play-list")
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "responses": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        },
+        "response_versions": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        },
+        "play_cards": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-play-cards",
+        },
+    }
+)
+class PlayCardTests(TestCase):
+    def setUp(self):
+        caches["play_cards"].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.play = Play.objects.create(title="Hamlet")
+        self.actor = Actor.objects.create(first_name="Jon", last_name="Doe")
+        self.genre = Genre.objects.create(name="Drama")
+
+    def test_list_served_from_cards(self):
+        self.client.get(PLAY_URL)
+
+        # conditional GET validators and the filtered play ids
+        with self.assertNumQueries(2):
+            res = self.client.get(PLAY_URL)
+
+        self.assertEqual(res.data, [PlayListSerializer(self.play).data])
+
+    def test_cards_rebuilt_on_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.play.actors.add(self.actor)
+            self.play.genres.add(self.genre)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.actor.last_name = "Snow"
+            self.actor.save()
+            self.genre.name = "Tragedy"
+            self.genre.save()
+
+        with self.assertNumQueries(2):
+            res = self.client.get(PLAY_URL)
+
+        self.assertEqual(res.data[0]["actors"], ["Jon Snow"])
+        self.assertEqual(res.data[0]["genres"], ["Tragedy"])
+
+    def test_deleted_play_card_dropped(self):
+        self.client.get(PLAY_URL)
+        play_id = self.play.id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.play.delete()
+
+        self.assertEqual(self.client.get(PLAY_URL).data, [])
+        self.assertIsNone(caches["play_cards"].get(f"play-card:{play_id}"))
+
+    def test_warm_play_cards(self):
+        call_command("warm_play_cards", stdout=StringIO())
+
+        with self.assertNumQueries(2):
+            self.client.get(PLAY_URL)
+
+
+class SharedPlayCardTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        shared = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                },
+                "play_cards": {
+                    "BACKEND": "django.core.cache.backends.filebased."
+                    "FileBasedCache",
+                    "LOCATION": directory,
+                },
+            }
+        )
+        shared.enable()
+        self.addCleanup(shared.disable)
+        self.play = Play.objects.create(title="Hamlet")
+
+    def test_refresh_reaches_other_cache_instances(self):
+        serving = caches["play_cards"]
+        get_play_cards([self.play.id])
+
+        # another process, ex. import_catalog, refreshes the card
+        caches["play_cards"] = caches.create_connection("play_cards")
+        Play.objects.filter(pk=self.play.id).update(title="Macbeth")
+        refresh_play_cards([self.play.id])
+        caches["play_cards"] = serving
+
+        with self.assertNumQueries(0):
+            cards = get_play_cards([self.play.id])
+        self.assertEqual(cards[0]["title"], "Macbeth")
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from theatre.models import Play, Actor
+
+PLAY_URL = reverse("theatre:play-list")
+
+
+class PlaySearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.hamlet = Play.objects.create(
+            title="Hamlet", description="The prince of Denmark"
+        )
+        self.lear = Play.objects.create(
+            title="King Lear", description="Hamlet is not here"
+        )
+        self.actor = Actor.objects.create(
+            first_name="Laurence", last_name="Olivier"
+        )
+
+    def search(self, **params):
+        res = self.client.get(PLAY_URL, params)
+        return [play["title"] for play in res.data]
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(self.search(search="haml"), ["Hamlet", "King Lear"])
+
+    def test_title_filter_matches_title_words_only(self):
+        self.assertEqual(self.search(title="hamlet"), ["Hamlet"])
+        self.assertEqual(self.search(title="lear king"), ["King Lear"])
+
+    def test_search_follows_actor_changes(self):
+        self.lear.actors.add(self.actor)
+        self.assertEqual(self.search(search="olivier"), ["King Lear"])
+
+        self.actor.last_name = "Fishburne"
+        self.actor.save()
+        self.assertEqual(self.search(search="olivier"), [])
+        self.assertEqual(self.search(search="fishburne"), ["King Lear"])
+
+        self.actor.delete()
+        self.assertEqual(self.search(search="fishburne"), [])
+
+    def test_search_follows_play_changes(self):
+        self.hamlet.title = "Macbeth"
+        self.hamlet.save()
+
+        self.assertEqual(self.search(title="hamlet"), [])
+        self.assertEqual(self.search(title="macbeth"), ["Macbeth"])
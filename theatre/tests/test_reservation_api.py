@@ -0,0 +1,171 @@
+from base64 import b64decode
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import (
+    Play,
+    Performance,
+    TheatreHall,
+    Reservation,
+    Ticket,
+)
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class ReservationCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=Play.objects.create(title="Play"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+
+    def reserve(self, *places, performance=None):
+        performance_id = (performance or self.performance).id
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": row, "seat": seat, "performance": performance_id}
+                    for row, seat in places
+                ]
+            },
+            format="json",
+        )
+
+    def test_group_booking_query_count_does_not_grow(self):
+        places = [(1, seat) for seat in range(1, 11)]
+
+        with self.assertNumQueries(10):
+            res = self.reserve(*places)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["tickets"]), 10)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 10)
+
+    def test_ticket_out_of_hall_range_rejected(self):
+        res = self.reserve((1, 1), (11, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data,
+            {
+                "row": "row number must be in available range: "
+                "(1, rows): (1, 10)"
+            },
+        )
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_unknown_performance_rejected(self):
+        res = self.reserve((1, 1), performance=Performance(id=999))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("performance", res.data["tickets"][0])
+
+    def test_all_taken_seats_reported(self):
+        self.reserve((2, 2), (3, 3))
+
+        res = self.reserve((1, 1), (3, 3), (2, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["taken_seats"],
+            [
+                {"performance": self.performance.id, "row": 2, "seat": 2},
+                {"performance": self.performance.id, "row": 3, "seat": 3},
+            ],
+        )
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_duplicate_seat_in_request_rejected(self):
+        res = self.reserve((1, 1), (1, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_integrity_error_reported_as_conflict(self):
+        Ticket.objects.bulk_create(
+            [
+                Ticket(
+                    performance=self.performance,
+                    reservation=Reservation.objects.create(user=self.user),
+                    row=5,
+                    seat=5,
+                )
+            ]
+        )
+
+        res = self.reserve((5, 5), (5, 6))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["taken_seats"],
+            [{"performance": self.performance.id, "row": 5, "seat": 5}],
+        )
+        self.assertEqual(Reservation.objects.count(), 1)
+
+
+class ReservationListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_reservations_paginated_by_cursor(self):
+        reservations = [
+            Reservation.objects.create(user=self.user) for _ in range(3)
+        ]
+
+        res = self.client.get(RESERVATION_URL, {"page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        self.assertEqual(
+            [reservation["id"] for reservation in res.data["results"]],
+            [reservations[2].id, reservations[1].id],
+        )
+
+        res = self.client.get(res.data["next"])
+
+        self.assertEqual(
+            [reservation["id"] for reservation in res.data["results"]],
+            [reservations[0].id],
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_cursor_keys_on_id_of_reservations_made_at_same_time(self):
+        reservations = [
+            Reservation.objects.create(user=self.user) for _ in range(3)
+        ]
+        Reservation.objects.update(created_at=reservations[0].created_at)
+
+        res = self.client.get(RESERVATION_URL, {"page_size": 2})
+        next_url = res.data["next"]
+        ids = [reservation["id"] for reservation in res.data["results"]]
+        res = self.client.get(next_url)
+        ids += [reservation["id"] for reservation in res.data["results"]]
+
+        self.assertEqual(
+            ids, [reservation.id for reservation in reversed(reservations)]
+        )
+        cursor = parse_qs(urlparse(next_url).query)["cursor"][0]
+        self.assertEqual(
+            parse_qs(b64decode(cursor).decode()),
+            {"p": [str(reservations[1].id)]},
+        )
@@ -0,0 +1,121 @@
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.cache import bump_version
+from theatre.models import Genre, TheatreHall
+
+GENRE_URL = reverse("theatre:genre-list")
+THEATRE_HALL_URL = reverse("theatre:theatrehall-list")
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cached = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                },
+                "responses": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": "test-responses",
+                },
+                "play_cards": {
+                    "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+                },
+                "response_versions": {
+                    "BACKEND": "django.core.cache.backends.filebased."
+                    "FileBasedCache",
+                    "LOCATION": directory,
+                    "TIMEOUT": None,
+                },
+            }
+        )
+        cached.enable()
+        self.addCleanup(cached.disable)
+        caches["responses"].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.genre = Genre.objects.create(name="Drama")
+
+    def test_cached_list_skips_database(self):
+        first = self.client.get(GENRE_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(GENRE_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(
+            second.json(), [{"id": self.genre.id, "name": "Drama"}]
+        )
+
+    def test_writes_invalidate_cached_list(self):
+        self.client.get(GENRE_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(GENRE_URL, {"name": "Comedy"})
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(
+            [genre["name"] for genre in res.json()], ["Drama", "Comedy"]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.genre.delete()
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual([genre["name"] for genre in res.json()], ["Comedy"])
+
+    def test_writes_from_other_processes_invalidate_cached_list(self):
+        self.client.get(GENRE_URL)
+        serving = caches["response_versions"]
+
+        # another process, ex. import_catalog, changes genres
+        caches["response_versions"] = caches.create_connection(
+            "response_versions"
+        )
+        Genre.objects.filter(pk=self.genre.id).update(name="Comedy")
+        bump_version(Genre)
+        caches["response_versions"] = serving
+
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual([genre["name"] for genre in res.json()], ["Comedy"])
+
+    def test_version_bumped_after_commit(self):
+        self.client.get(GENRE_URL)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Genre.objects.create(name="Comedy")
+            with self.assertNumQueries(0):
+                self.client.get(GENRE_URL)
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_models_are_versioned_separately(self):
+        self.client.get(GENRE_URL)
+        TheatreHall.objects.create(name="Blue", rows=1, seats_in_row=1)
+
+        with self.assertNumQueries(0):
+            self.client.get(GENRE_URL)
+
+    def test_permissions_checked_on_cache_hit(self):
+        self.client.get(GENRE_URL)
+        self.client.force_authenticate(None)
+
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
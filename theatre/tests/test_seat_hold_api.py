@@ -0,0 +1,130 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Play, Performance, TheatreHall, SeatHold
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+
+
+def hold_url(performance_id):
+    return reverse("theatre:performance-hold", args=[performance_id])
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=Play.objects.create(title="Play"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+
+    def hold(self, *places, **payload):
+        payload["seats"] = [{"row": row, "seat": seat} for row, seat in places]
+        return self.client.post(
+            hold_url(self.performance.id), payload, format="json"
+        )
+
+    def reserve(self, *places):
+        return self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {
+                        "row": row,
+                        "seat": seat,
+                        "performance": self.performance.id,
+                    }
+                    for row, seat in places
+                ]
+            },
+            format="json",
+        )
+
+    def test_hold_seats(self):
+        res = self.hold((1, 1), (1, 2), minutes=5)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            res.data["held_places"],
+            [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+        )
+        res = self.client.get(PERFORMANCE_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 98)
+
+    def test_expired_holds_are_available(self):
+        self.hold((1, 1), (1, 2))
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        res = self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(res.data["results"][0]["tickets_available"], 100)
+
+    def test_new_hold_replaces_previous_one(self):
+        self.hold((1, 1), (1, 2))
+        self.hold((2, 1))
+
+        self.assertEqual(SeatHold.objects.get().seats_count, 1)
+
+    def test_seats_held_by_other_user_are_not_available(self):
+        self.hold((3, 3))
+        self.client.force_authenticate(self.other_user)
+
+        hold_res = self.hold((3, 3))
+        reserve_res = self.reserve((3, 3))
+
+        self.assertEqual(hold_res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(reserve_res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_reservation_consumes_own_hold(self):
+        self.hold((4, 4), (4, 5))
+
+        res = self.reserve((4, 4), (4, 5))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 2)
+
+    def test_release_hold(self):
+        self.hold((5, 5))
+
+        res = self.client.delete(hold_url(self.performance.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_expired_holds_are_swept(self):
+        self.hold((6, 6))
+        self.client.force_authenticate(self.other_user)
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertEqual(self.hold((6, 6)).status_code, 201)
+        call_command("expire_seat_holds", stdout=StringIO())
+
+        self.assertEqual(SeatHold.objects.count(), 1)
+        res = self.client.get(PERFORMANCE_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 99)
@@ -0,0 +1,227 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import (
+    Play,
+    Performance,
+    TheatreHall,
+    Reservation,
+    Ticket,
+)
+from theatre.seat_map import SeatMap
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+
+
+def performance_detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+class SeatMapTests(TestCase):
+    def test_take_and_release_seats(self):
+        seat_map = SeatMap(rows=3, seats_in_row=5)
+
+        seat_map.take(1, 1)
+        seat_map.take(3, 5)
+        seat_map.take(4, 1)
+
+        self.assertTrue(seat_map.is_taken(3, 5))
+        self.assertFalse(seat_map.is_taken(2, 2))
+        self.assertFalse(seat_map.is_taken(4, 1))
+        self.assertEqual(seat_map.taken_places(), [(1, 1), (3, 5)])
+        self.assertEqual(len(seat_map.to_bytes()), 2)
+
+        seat_map.release(1, 1)
+
+        self.assertEqual(len(seat_map), 1)
+
+
+class PerformanceSeatMapTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+        self.client.force_authenticate(self.user)
+        self.theatre_hall = TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        self.performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=Play.objects.create(title="Play"),
+            theatre_hall=self.theatre_hall,
+        )
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def seat_map(self):
+        self.performance.refresh_from_db()
+        return SeatMap.for_performance(self.performance)
+
+    def test_seat_map_follows_tickets(self):
+        ticket = Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=2,
+            seat=3,
+        )
+        self.assertEqual(self.seat_map().taken_places(), [(2, 3)])
+
+        ticket.delete()
+        self.assertEqual(self.seat_map().taken_places(), [])
+
+    def test_taken_places_are_read_from_seat_map(self):
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=4,
+            seat=5,
+        )
+
+        res = self.client.get(performance_detail_url(self.performance.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_places"], [{"row": 4, "seat": 5}])
+
+    def test_reserve_taken_seat_rejected(self):
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=1,
+            seat=1,
+        )
+
+        res = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "performance": self.performance.id}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_rebuild_seat_maps_fixes_drift(self):
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=7,
+            seat=7,
+        )
+        Performance.objects.filter(pk=self.performance.pk).update(
+            seat_map=b""
+        )
+
+        call_command("rebuild_seat_maps", stdout=StringIO())
+
+        self.assertEqual(self.seat_map().taken_places(), [(7, 7)])
+
+    def test_tickets_sold_follows_tickets(self):
+        ticket = Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=1,
+            seat=2,
+        )
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 1)
+
+        res = self.client.get(PERFORMANCE_URL)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 99)
+
+        ticket.delete()
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 0)
+
+    def test_reconcile_tickets_sold(self):
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=3,
+            seat=3,
+        )
+        Performance.objects.filter(pk=self.performance.pk).update(
+            tickets_sold=40
+        )
+
+        call_command("reconcile_tickets_sold", stdout=StringIO())
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 1)
+
+    def test_hall_layout_change_rebuilds_seat_maps(self):
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=2,
+            seat=3,
+        )
+
+        self.theatre_hall.seats_in_row = 12
+        self.theatre_hall.save()
+
+        self.assertEqual(self.seat_map().taken_places(), [(2, 3)])
+
+    def test_ticket_outside_shrunk_hall_released(self):
+        ticket = Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=10,
+            seat=10,
+        )
+        self.theatre_hall.rows = 5
+        self.theatre_hall.save()
+
+        ticket.delete()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 0)
+
+    def test_performance_hall_change_rebuilds_seat_map(self):
+        Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=2,
+            seat=3,
+        )
+
+        self.performance.theatre_hall = TheatreHall.objects.create(
+            name="Red", rows=5, seats_in_row=20
+        )
+        self.performance.save()
+
+        self.assertEqual(self.seat_map().taken_places(), [(2, 3)])
+
+    def test_moved_ticket_frees_old_seat(self):
+        ticket = Ticket.objects.create(
+            performance=self.performance,
+            reservation=self.reservation,
+            row=2,
+            seat=3,
+        )
+        other = Performance.objects.create(
+            show_time="2022-06-03 14:00:00+00:00",
+            play=self.performance.play,
+            theatre_hall=self.theatre_hall,
+        )
+
+        ticket.performance = other
+        ticket.save()
+
+        self.assertEqual(self.seat_map().taken_places(), [])
+        self.assertEqual(self.performance.tickets_sold, 0)
+        other.refresh_from_db()
+        self.assertEqual(
+            SeatMap.for_performance(other).taken_places(), [(2, 3)]
+        )
+        self.assertEqual(other.tickets_sold, 1)
@@ -212,6 +212,28 @@ class AuthenticatedCinemaTests(TestCase):
         self.assertIn(serializer1.data, res.data)
         self.assertNotIn(serializer2.data, res.data)
 
+    def test_filter_play_by_all_actors(self):
+        play1 = sample_play(title="play 1")
+        play2 = sample_play(title="play 2")
+
+        actor1 = sample_actor()
+        actor2 = sample_actor(first_name="Brad", last_name="Pitt")
+
+        play1.actors.add(actor1, actor2)
+        play2.actors.add(actor1)
+
+        res_any = self.client.get(
+            PLAY_URL, {"actors": f"{actor1.id},{actor2.id}"}
+        )
+        res_all = self.client.get(
+            PLAY_URL, {"actors": f"{actor1.id},{actor2.id}", "match": "all"}
+        )
+
+        self.assertEqual(
+            [play["id"] for play in res_any.data], [play1.id, play2.id]
+        )
+        self.assertEqual([play["id"] for play in res_all.data], [play1.id])
+
     def test_retrieve_play_detail(self):
         play = sample_play()
         play.actors.add(sample_actor())
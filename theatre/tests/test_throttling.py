@@ -0,0 +1,89 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from theatre.models import Play, Performance, TheatreHall
+from theatre.throttling import ReservationRateThrottle, TokenBucketStore
+
+
+class TokenBucketStoreTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "throttle.sqlite3")
+
+    def test_bucket_shared_between_stores(self):
+        first = TokenBucketStore(self.path)
+        second = TokenBucketStore(self.path)
+
+        self.assertEqual(first.consume("user_1", 2, 1 / 60), 0)
+        self.assertEqual(second.consume("user_1", 2, 1 / 60), 0)
+
+        wait = first.consume("user_1", 2, 1 / 60)
+
+        self.assertAlmostEqual(wait, 60, delta=1)
+        self.assertEqual(second.consume("user_2", 2, 1 / 60), 0)
+
+    def test_bucket_refills(self):
+        store = TokenBucketStore(self.path)
+
+        with mock.patch("theatre.throttling.time.time", return_value=100):
+            store.consume("key", 1, 1)
+            self.assertGreater(store.consume("key", 1, 1), 0)
+        with mock.patch("theatre.throttling.time.time", return_value=101):
+            self.assertEqual(store.consume("key", 1, 1), 0)
+
+
+class ReservationThrottleTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            THROTTLE_ENABLED=True,
+            THROTTLE_DATABASE=os.path.join(directory.name, "throttle.db"),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "password")
+        )
+        self.performance = Performance.objects.create(
+            show_time="2022-06-02 14:00:00+00:00",
+            play=Play.objects.create(title="Play"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+        )
+
+    @mock.patch.object(ReservationRateThrottle, "rate", "2/minute", create=True)
+    def test_reservation_create_throttled(self):
+        for seat in range(1, 4):
+            res = self.client.post(
+                reverse("theatre:reservation-list"),
+                {
+                    "tickets": [
+                        {
+                            "row": 1,
+                            "seat": seat,
+                            "performance": self.performance.id,
+                        }
+                    ]
+                },
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        res = self.client.get(reverse("theatre:reservation-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 2)
@@ -0,0 +1,136 @@
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework import throttling
+
+# rows of buckets left untouched for this long are full again and dropped
+PRUNE_AFTER = 24 * 60 * 60
+
+PRUNE_EVERY = 1000
+
+
+class TokenBucketStore:
+    """Token buckets kept in a SQLite file shared by the worker processes
+    of a host
+
+    Every check reads and writes a single row inside an immediate
+    transaction, so concurrent processes never lose updates.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_bucket ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def consume(self, key, capacity, refill_rate):
+        """Take a token from the bucket of ``key``
+
+        Returns 0 when a token was taken, otherwise the seconds until the
+        next token is available.
+        """
+        connection = self._connection()
+        now = time.time()
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM throttle_bucket "
+                "WHERE key = ?",
+                [key],
+            ).fetchone()
+            tokens = capacity
+            if row is not None:
+                elapsed = max(now - row[1], 0)
+                tokens = min(capacity, row[0] + elapsed * refill_rate)
+
+            if tokens < 1:
+                connection.execute("ROLLBACK")
+                return (1 - tokens) / refill_rate
+
+            connection.execute(
+                "INSERT INTO throttle_bucket (key, tokens, updated_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "tokens = excluded.tokens, updated_at = excluded.updated_at",
+                [key, tokens - 1, now],
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+
+        self._calls += 1
+        if self._calls % PRUNE_EVERY == 0:
+            connection.execute(
+                "DELETE FROM throttle_bucket WHERE updated_at < ?",
+                [now - PRUNE_AFTER],
+            )
+        return 0
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    path = str(settings.THROTTLE_DATABASE)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = TokenBucketStore(path)
+        return _stores[path]
+
+
+class TokenBucketThrottleMixin:
+    """Check ``SimpleRateThrottle`` rates against shared token buckets
+
+    A rate of ``30/minute`` allows bursts of 30 requests, refilled at
+    one token every two seconds.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None or not settings.THROTTLE_ENABLED:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self._wait = get_store().consume(
+            self.key,
+            capacity=self.num_requests,
+            refill_rate=self.num_requests / self.duration,
+        )
+        return self._wait == 0
+
+    def wait(self):
+        return self._wait
+
+
+class AnonRateThrottle(TokenBucketThrottleMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(TokenBucketThrottleMixin, throttling.UserRateThrottle):
+    pass
+
+
+class ReservationRateThrottle(UserRateThrottle):
+    scope = "reservation"
@@ -2,6 +2,11 @@ from django.urls import path, include
 
 from rest_framework import routers
 
+from theatre.async_views import (
+    AsyncPerformanceViewSet,
+    AsyncPlayViewSet,
+    AsyncReservationViewSet,
+)
 from theatre.views import (
     GenreViewSet,
     ActorViewSet,
@@ -19,6 +24,38 @@ router.register("plays", PlayViewSet)
 router.register("performances", PerformanceViewSet)
 router.register("reservations", ReservationViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+# read-only endpoints served natively by an ASGI worker
+async_urlpatterns = [
+    path(
+        "plays/",
+        AsyncPlayViewSet.as_view({"get": "list"}),
+        name="async-play-list",
+    ),
+    path(
+        "plays/<pk>/",
+        AsyncPlayViewSet.as_view({"get": "retrieve"}),
+        name="async-play-detail",
+    ),
+    path(
+        "performances/",
+        AsyncPerformanceViewSet.as_view({"get": "list"}),
+        name="async-performance-list",
+    ),
+    path(
+        "performances/<pk>/",
+        AsyncPerformanceViewSet.as_view({"get": "retrieve"}),
+        name="async-performance-detail",
+    ),
+    path(
+        "reservations/",
+        AsyncReservationViewSet.as_view({"get": "list"}),
+        name="async-reservation-list",
+    ),
+]
+
+urlpatterns = [
+    path("async/", include(async_urlpatterns)),
+    path("", include(router.urls)),
+]
 
 app_name = "theatre"
@@ -1,12 +1,27 @@
-from django.db.models import F, Count
+from django.db.models import Count, Exists, F, Max, OuterRef, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from theatre.cache import CachedListMixin, PlayCardListMixin
+from theatre.conditional import ConditionalGetMixin
+from theatre.exports import (
+    EXPORT_FORMATS,
+    export_chunks,
+    export_filters,
+    export_lines,
+    export_queryset,
+)
+from theatre.fieldsets import FIELDSET_PARAMETERS, requested_fieldset
+from theatre.images import schedule_image_variants
+from theatre.params import param_to_datetime
 from theatre.permissions import IsAdminOrIfAuthenticatedReadOnly
 from theatre.models import (
     Genre,
@@ -23,16 +38,22 @@ from theatre.serializers import (
     PlaySerializer,
     PlayListSerializer,
     PlayDetailSerializer,
+    PerformanceScheduleSerializer,
     PerformanceSerializer,
     PerformanceListSerializer,
     PerformanceDetailSerializer,
     ReservationSerializer,
     ReservationListSerializer,
     PlayImageSerializer,
+    SeatHoldSerializer,
 )
+from theatre.search import search_plays
+from theatre.seat_map import active_holds_count, release_holds
+from theatre.throttling import ReservationRateThrottle
 
 
 class GenreViewSet(
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -43,6 +64,7 @@ class GenreViewSet(
 
 
 class ActorViewSet(
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -53,6 +75,7 @@ class ActorViewSet(
 
 
 class TheatreHallViewSet(
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -62,7 +85,15 @@ class TheatreHallViewSet(
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
 
+# Play fields of the list and detail serializers read from its own columns
+PLAY_COLUMNS = {"title", "description", "image", "image_variants"}
+
+PLAY_RELATIONS = {"genres", "actors"}
+
+
 class PlayViewSet(
+    ConditionalGetMixin,
+    PlayCardListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -76,25 +107,98 @@ class PlayViewSet(
     def _params_to_ints(queryset):
         return [int(str_id) for str_id in queryset.split(",")]
 
+    @staticmethod
+    def _filter_related(queryset, through, field, ids, match_all):
+        """Filter plays linked to any (or all) ids through EXISTS
+        subqueries, so the M2M join does not multiply play rows
+        """
+        links = through.objects.filter(play_id=OuterRef("pk"))
+        if not match_all:
+            return queryset.filter(
+                Exists(links.filter(**{f"{field}__in": ids}))
+            )
+        for related_id in set(ids):
+            queryset = queryset.filter(
+                Exists(links.filter(**{field: related_id}))
+            )
+        return queryset
+
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = self.queryset.all()
+
+        fields, _ = requested_fieldset(self.request)
+        if fields is not None:
+            queryset = Play.objects.only(
+                "id", *(PLAY_COLUMNS & fields.keys())
+            ).prefetch_related(*(PLAY_RELATIONS & fields.keys()))
 
         actors = self.request.query_params.get("actors")
         genres = self.request.query_params.get("genres")
         title = self.request.query_params.get("title")
+        search = self.request.query_params.get("search")
+        match = self.request.query_params.get("match", "any")
+
+        if match not in ("all", "any"):
+            raise ValidationError({"match": "Must be one of: all, any."})
 
         if actors:
             actors_ids = self._params_to_ints(actors)
-            queryset = queryset.filter(actors__id__in=actors_ids)
+            queryset = self._filter_related(
+                queryset,
+                Play.actors.through,
+                "actor_id",
+                actors_ids,
+                match == "all",
+            )
 
         if genres:
             genres_ids = self._params_to_ints(genres)
-            queryset = queryset.filter(genres__id__in=genres_ids)
+            queryset = self._filter_related(
+                queryset,
+                Play.genres.through,
+                "genre_id",
+                genres_ids,
+                match == "all",
+            )
 
         if title:
-            queryset = queryset.filter(title__icontains=title)
+            queryset = search_plays(queryset, title, title_only=True)
 
-        return queryset.distinct()
+        if search:
+            queryset = search_plays(queryset, search)
+
+        return queryset
+
+    def get_validators(self):
+        if self.action == "list":
+            stats = (
+                self.get_queryset()
+                .order_by()
+                .aggregate(count=Count("pk"), last_modified=Max("updated_at"))
+            )
+            last_modified = stats["last_modified"]
+            return (
+                stats["count"],
+                last_modified.timestamp() if last_modified else 0,
+            ), last_modified
+
+        if self.action == "retrieve":
+            try:
+                last_modified = (
+                    Play.objects.filter(pk=self.kwargs["pk"])
+                    .values_list("updated_at", flat=True)
+                    .first()
+                )
+            except (TypeError, ValueError):
+                return None
+            if last_modified is None:
+                return None
+            return (
+                self.kwargs["pk"],
+                last_modified.timestamp(),
+            ), last_modified
+
+        return None
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -113,12 +217,17 @@ class PlayViewSet(
         permission_classes=[IsAdminUser],
     )
     def upload_image(self, request, pk=None):
-        """Endpoint for uploading image to specific play"""
+        """Endpoint for uploading image to specific play
+
+        Resized variants are rendered in the background once the upload
+        is stored.
+        """
         play = self.get_object()
         serializer = self.get_serializer(play, data=request.data)
 
         if serializer.is_valid():
             serializer.save()
+            schedule_image_variants(play.id)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -128,7 +237,14 @@ class PlayViewSet(
             OpenApiParameter(
                 "title",
                 type=str,
-                description="Filter by title (ex. ?title=test)",
+                description="Filter by words of title (ex. ?title=test)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "search",
+                type=str,
+                description="Full-text search over title, description "
+                "and actors, ordered by relevance (ex. ?search=hamlet)",
                 required=False,
             ),
             OpenApiParameter(
@@ -143,44 +259,272 @@ class PlayViewSet(
                 description="Filter by actors id (ex. ?actors=2,5)",
                 required=False,
             ),
+            OpenApiParameter(
+                "match",
+                type=str,
+                enum=["any", "all"],
+                description="Whether plays need any (default) or all of the "
+                "listed genres and actors (ex. ?actors=2,5&match=all)",
+                required=False,
+            ),
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+# PerformanceListSerializer fields read from each related object
+PERFORMANCE_RELATION_FIELDS = {
+    "play": {"play", "play_title"},
+    "theatre_hall": {
+        "theatre_hall",
+        "theatre_hall_name",
+        "theatre_hall_capacity",
+    },
+}
+
+
+def performance_relations(fields):
+    """Relations a ``PerformanceListSerializer`` fieldset reads"""
+    return [
+        relation
+        for relation, names in PERFORMANCE_RELATION_FIELDS.items()
+        if fields is None or fields.keys() & names
+    ]
+
+
+class PerformancePagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class PerformanceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Performance.objects.select_related("play", "theatre_hall")
     serializer_class = PerformanceSerializer
+    pagination_class = PerformancePagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    @staticmethod
+    def _param_to_int(name, value):
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: "A valid integer is required."})
+
     def get_queryset(self):
         queryset = self.queryset
 
         if self.action == "list":
-            queryset = queryset.select_related(
-                "play", "theatre_hall"
-            ).annotate(
-                tickets_available=F("theatre_hall__seats_in_row")
-                * F("theatre_hall__rows")
-                - Count("tickets")
-            )
+            date_from = self.request.query_params.get("date_from")
+            date_to = self.request.query_params.get("date_to")
+            play = self.request.query_params.get("play")
+            theatre_hall = self.request.query_params.get("theatre_hall")
+            min_available = self.request.query_params.get("min_available")
+
+            fields, expand = requested_fieldset(self.request)
+            if fields is not None:
+                related = performance_relations(fields)
+                queryset = Performance.objects.only(
+                    "id", "show_time", *related
+                )
+                if related:
+                    queryset = queryset.select_related(*related)
+            if "play" in expand:
+                queryset = queryset.prefetch_related(
+                    "play__genres", "play__actors"
+                )
+            if (
+                fields is None
+                or "tickets_available" in fields
+                or min_available
+            ):
+                queryset = queryset.annotate(
+                    tickets_available=F("theatre_hall__seats_in_row")
+                    * F("theatre_hall__rows")
+                    - F("tickets_sold")
+                    - active_holds_count()
+                )
+
+            if date_from:
+                show_time_from, _ = param_to_datetime("date_from", date_from)
+                queryset = queryset.filter(show_time__gte=show_time_from)
+
+            if date_to:
+                show_time_to, is_date = param_to_datetime(
+                    "date_to", date_to, end_of_day=True
+                )
+                if is_date:
+                    queryset = queryset.filter(show_time__lt=show_time_to)
+                else:
+                    queryset = queryset.filter(show_time__lte=show_time_to)
+
+            if play:
+                queryset = queryset.filter(
+                    play_id=self._param_to_int("play", play)
+                )
+
+            if theatre_hall:
+                queryset = queryset.filter(
+                    theatre_hall_id=self._param_to_int(
+                        "theatre_hall", theatre_hall
+                    )
+                )
+
+            if min_available:
+                queryset = queryset.filter(
+                    tickets_available__gte=self._param_to_int(
+                        "min_available", min_available
+                    )
+                )
+
+            queryset = queryset.order_by("show_time", "id")
 
         return queryset
 
+    def get_validators(self):
+        if self.action != "retrieve":
+            return None
+
+        # held places change when a hold expires, which writes no row,
+        # so the latest expiry of not yet swept holds counts as a change
+        now = timezone.now()
+        try:
+            changes = (
+                Performance.objects.filter(pk=self.kwargs["pk"])
+                .annotate(
+                    active_holds=Count(
+                        "holds", filter=Q(holds__expires_at__gt=now)
+                    ),
+                    holds_expired_at=Max(
+                        "holds__expires_at",
+                        filter=Q(holds__expires_at__lte=now),
+                    ),
+                )
+                .values_list(
+                    "updated_at",
+                    "play__updated_at",
+                    "holds_expired_at",
+                    "active_holds",
+                )
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+        if changes is None:
+            return None
+        *updated, active_holds = changes
+        updated = [updated_at for updated_at in updated if updated_at]
+        return (
+            self.kwargs["pk"],
+            *(updated_at.timestamp() for updated_at in updated),
+            active_holds,
+        ), max(updated)
+
     def get_serializer_class(self):
         if self.action == "list":
             return PerformanceListSerializer
         if self.action == "retrieve":
             return PerformanceDetailSerializer
+        if self.action == "hold":
+            return SeatHoldSerializer
+        if self.action == "schedule":
+            return PerformanceScheduleSerializer
 
         return PerformanceSerializer
 
+    @action(
+        methods=["POST", "DELETE"],
+        detail=True,
+        url_path="hold",
+        permission_classes=[IsAuthenticated],
+    )
+    def hold(self, request, pk=None):
+        """Endpoint for holding seats of specific performance for a while"""
+        performance = self.get_object()
+
+        if request.method == "DELETE":
+            release_holds(performance, request.user.id)
+            return Response(status=status.HTTP_204_NO_CONTENT)
 
-class ReservationPagination(PageNumberPagination):
-    page_size = 2
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(performance=performance, user_id=request.user.id)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(responses=PerformanceSerializer(many=True))
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="schedule",
+        permission_classes=[IsAdminUser],
+    )
+    def schedule(self, request):
+        """Endpoint creating the performances of a recurring schedule
+
+        Show times overlapping other performances of the hall are
+        rejected with 409 and nothing is created.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        performances = serializer.save()
+
+        return Response(
+            PerformanceSerializer(performances, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "date_from",
+                type=str,
+                description="Filter by show time from date or datetime "
+                "(ex. ?date_from=2023-09-01)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=str,
+                description="Filter by show time up to date or datetime, "
+                "inclusive (ex. ?date_to=2023-09-30)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "play",
+                type=int,
+                description="Filter by play id (ex. ?play=2)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "theatre_hall",
+                type=int,
+                description="Filter by theatre hall id (ex. ?theatre_hall=2)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "min_available",
+                type=int,
+                description="Only performances with at least N available "
+                "seats (ex. ?min_available=4)",
+                required=False,
+            ),
+            *FIELDSET_PARAMETERS,
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class ReservationPagination(CursorPagination):
+    page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    # DRF cursors hold a position in the first ordering field only, ids
+    # are unique and grow with created_at so pages neither skip nor repeat
+    ordering = "-id"
 
 
 class ReservationViewSet(viewsets.ModelViewSet):
@@ -190,16 +534,44 @@ class ReservationViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        queryset = self.queryset.filter(user=self.request.user)
+        queryset = self.queryset.filter(user_id=self.request.user.id)
 
         if self.action == "list":
-            queryset = queryset.prefetch_related(
-                "tickets__performance__theatre_hall",
-                "tickets__performance__play"
-            )
+            fields, expand = requested_fieldset(self.request)
+            if fields is not None:
+                queryset = queryset.only("id", "created_at")
+            tickets = {} if fields is None else fields.get("tickets")
+            if tickets is not None:
+                queryset = queryset.prefetch_related("tickets")
+            if tickets is not None and (
+                not tickets or "performance" in tickets
+            ):
+                relations = performance_relations(
+                    tickets.get("performance") or None
+                )
+                queryset = queryset.prefetch_related(
+                    "tickets__performance",
+                    *(
+                        f"tickets__performance__{relation}"
+                        for relation in relations
+                    ),
+                )
+                performance_expand = expand.get("tickets", {}).get(
+                    "performance", {}
+                )
+                if "play" in relations and "play" in performance_expand:
+                    queryset = queryset.prefetch_related(
+                        "tickets__performance__play__genres",
+                        "tickets__performance__play__actors",
+                    )
 
         return queryset
 
+    def get_throttles(self):
+        if self.action == "create":
+            return [*super().get_throttles(), ReservationRateThrottle()]
+        return super().get_throttles()
+
     def get_serializer_class(self):
         if self.action == "list":
             return ReservationListSerializer
@@ -207,4 +579,60 @@ class ReservationViewSet(viewsets.ModelViewSet):
         return ReservationSerializer
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "output",
+                type=str,
+                enum=list(EXPORT_FORMATS),
+                description="Export format, ndjson by default "
+                "(ex. ?output=csv)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "date_from",
+                type=str,
+                description="Reservations made since date or datetime "
+                "(ex. ?date_from=2023-09-01)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=str,
+                description="Reservations made up to date or datetime, "
+                "inclusive (ex. ?date_to=2023-09-30)",
+                required=False,
+            ),
+        ],
+        responses=str,
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="export",
+        permission_classes=[IsAdminUser],
+    )
+    def export(self, request):
+        """Endpoint streaming tickets of all reservations as NDJSON or CSV"""
+        output = request.query_params.get("output", "ndjson")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"output": f"Must be one of: {', '.join(EXPORT_FORMATS)}."}
+            )
+
+        queryset = export_queryset(
+            **export_filters(
+                request.query_params.get("date_from"),
+                request.query_params.get("date_to"),
+            )
+        )
+        response = StreamingHttpResponse(
+            export_chunks(export_lines(queryset, output)),
+            content_type=EXPORT_FORMATS[output],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="reservations.{output}"'
+        )
+        return response
@@ -0,0 +1,100 @@
+"""
+Read/write splitting between the primary database and read replicas.
+
+Writes always go to ``settings.DATABASE_PRIMARY``. Reads of safe (GET,
+HEAD, OPTIONS) requests go to one of ``settings.DATABASE_REPLICAS``,
+unless the request is pinned to the primary:
+
+- requests with unsafe methods are pinned as a whole,
+- a request is pinned from its first write on,
+- clients that wrote get a short-lived cookie that pins their following
+  requests, so they read their own writes despite replication lag.
+
+Code running outside of a request (management commands, workers) reads
+from the primary.
+"""
+import asyncio
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+PIN_COOKIE = "db_pin_primary"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RequestRouting:
+    """Routing state of the current request"""
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_routing = ContextVar("db_routing", default=None)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or routing.pinned or not settings.DATABASE_REPLICAS:
+            return settings.DATABASE_PRIMARY
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.pinned = True
+            routing.wrote = True
+        return settings.DATABASE_PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {settings.DATABASE_PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def _start_routing(request):
+    return _routing.set(
+        RequestRouting(
+            pinned=request.method not in SAFE_METHODS
+            or PIN_COOKIE in request.COOKIES
+        )
+    )
+
+
+def _finish_routing(response, token):
+    routing = _routing.get()
+    _routing.reset(token)
+    if routing.wrote:
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=settings.DATABASE_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def primary_pinning_middleware(get_response):
+    """Track which database the reads of each request may use"""
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            token = _start_routing(request)
+            response = await get_response(request)
+            return _finish_routing(response, token)
+
+    else:
+
+        def middleware(request):
+            token = _start_routing(request)
+            response = get_response(request)
+            return _finish_routing(response, token)
+
+    return middleware
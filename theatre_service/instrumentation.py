@@ -0,0 +1,155 @@
+"""
+Per-request timing of database queries, serialization and the request.
+
+Enabled with ``settings.REQUEST_INSTRUMENTATION``, otherwise the middleware
+removes itself at startup and nothing is hooked. When enabled:
+
+- every database connection gets an execute wrapper timing its queries,
+- ``BaseSerializer.data`` is wrapped to time top-level serialization,
+- responses get a ``Server-Timing`` header and a JSON log line,
+- a sample of slow requests is logged with their SQL.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+_stats = ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    """Timings collected while a request is handled"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.sql = []
+
+
+def _time_query(execute, sql, params, many, context):
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        stats.queries += 1
+        stats.db_time += duration
+        if len(stats.sql) < settings.SLOW_REQUEST_MAX_QUERIES:
+            stats.sql.append((sql, duration))
+
+
+def _wrap_connection(connection, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+def _timed_data(data):
+    def timed(self):
+        stats = _stats.get()
+        if stats is None or stats.serializing:
+            return data.fget(self)
+
+        stats.serializing = True
+        started = time.perf_counter()
+        try:
+            return data.fget(self)
+        finally:
+            stats.serializer_time += time.perf_counter() - started
+            stats.serializing = False
+
+    timed.instrumented = True
+    return property(timed)
+
+
+def install():
+    """Hook query and serializer timing, safe to call repeatedly"""
+    connection_created.connect(
+        _wrap_connection, dispatch_uid="request_instrumentation"
+    )
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+    if not getattr(BaseSerializer.data.fget, "instrumented", False):
+        BaseSerializer.data = _timed_data(BaseSerializer.data)
+
+
+def _milliseconds(seconds):
+    return round(seconds * 1000, 2)
+
+
+def _finish(request, response, stats, token):
+    _stats.reset(token)
+    total = time.perf_counter() - stats.started
+
+    response["Server-Timing"] = (
+        f'db;dur={_milliseconds(stats.db_time)};desc="{stats.queries} '
+        f'queries", serializer;dur={_milliseconds(stats.serializer_time)}, '
+        f"total;dur={_milliseconds(total)}"
+    )
+
+    match = getattr(request, "resolver_match", None)
+    record = {
+        "method": request.method,
+        "path": request.path,
+        "route": match.view_name if match else None,
+        "status": response.status_code,
+        "duration_ms": _milliseconds(total),
+        "db_ms": _milliseconds(stats.db_time),
+        "queries": stats.queries,
+        "serializer_ms": _milliseconds(stats.serializer_time),
+    }
+    if (
+        total * 1000 >= settings.SLOW_REQUEST_MS
+        and random.random() < settings.SLOW_REQUEST_SAMPLE_RATE
+    ):
+        record["sql"] = [
+            {"sql": sql, "duration_ms": _milliseconds(duration)}
+            for sql, duration in stats.sql
+        ]
+        logger.warning(json.dumps(record))
+    else:
+        logger.info(json.dumps(record))
+    return response
+
+
+@sync_and_async_middleware
+def instrumentation_middleware(get_response):
+    """Time queries, serialization and the whole of every request"""
+    if not settings.REQUEST_INSTRUMENTATION:
+        raise MiddlewareNotUsed()
+    install()
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            stats = RequestStats()
+            token = _stats.set(stats)
+            response = await get_response(request)
+            return _finish(request, response, stats, token)
+
+    else:
+
+        def middleware(request):
+            stats = RequestStats()
+            token = _stats.set(stats)
+            response = get_response(request)
+            return _finish(request, response, stats, token)
+
+    return middleware
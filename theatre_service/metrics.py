@@ -0,0 +1,332 @@
+"""
+Prometheus-style metrics shared by the worker processes of a host.
+
+Every thread of every process writes its own memory-mapped file in
+``settings.METRICS_DIR``, so recording a value is a dict lookup and a
+few unlocked writes to the map. ``/metrics`` sums the files of all
+processes. Counters of exited processes stay in their files, the
+directory should be emptied before the server starts.
+
+File layout: an 8 byte header with the number of bytes in use, then
+entries of ``key length, slot count, key (padded to 8 bytes), slots``
+with slots being float64 values. Entries are written before the header
+is updated, so readers never see a partial entry.
+"""
+import asyncio
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import sync_and_async_middleware
+
+HEADER = struct.Struct("Q")
+ENTRY = struct.Struct("II")
+VALUE = struct.Struct("d")
+
+INITIAL_SIZE = 64 * 1024
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+class MetricsFile:
+    """Memory-mapped slots written by a single thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self._offsets = {}
+        self._file = open(path, "a+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < INITIAL_SIZE:
+            self._file.truncate(INITIAL_SIZE)
+            size = INITIAL_SIZE
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._used = HEADER.unpack_from(self._map)[0] or HEADER.size
+        for key, offset, _ in _entries(self._map, self._used):
+            self._offsets[key] = offset
+
+    def _allocate(self, key, slots):
+        encoded = json.dumps(key).encode()
+        size = ENTRY.size + _padded(len(encoded)) + slots * VALUE.size
+        if self._used + size > len(self._map):
+            new_size = max(len(self._map) * 2, self._used + size)
+            self._file.truncate(new_size)
+            self._map.resize(new_size)
+
+        ENTRY.pack_into(self._map, self._used, len(encoded), slots)
+        self._map[
+            self._used + ENTRY.size:self._used + ENTRY.size + len(encoded)
+        ] = encoded
+        offset = self._used + ENTRY.size + _padded(len(encoded))
+        self._used += size
+        HEADER.pack_into(self._map, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def add(self, key, slots, slot, amount):
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = self._allocate(key, slots)
+        offset += slot * VALUE.size
+        VALUE.pack_into(
+            self._map, offset, VALUE.unpack_from(self._map, offset)[0] + amount
+        )
+
+
+def _entries(data, used):
+    """Yield ``(key, offset, slot count)`` of the entries of a file"""
+    position = HEADER.size
+    while position < used:
+        key_size, slots = ENTRY.unpack_from(data, position)
+        start = position + ENTRY.size
+        key = json.loads(bytes(data[start:start + key_size]))
+        offset = start + _padded(key_size)
+        yield tuple(key), offset, slots
+        position = offset + slots * VALUE.size
+
+
+_local = threading.local()
+_files_lock = threading.Lock()
+
+
+def _file():
+    metrics_file = getattr(_local, "file", None)
+    directory = settings.METRICS_DIR
+    if (
+        metrics_file is None
+        or metrics_file.pid != os.getpid()
+        or os.path.dirname(metrics_file.path) != directory
+    ):
+        with _files_lock:
+            os.makedirs(directory, exist_ok=True)
+            metrics_file = _local.file = MetricsFile(
+                os.path.join(
+                    directory,
+                    f"{os.getpid()}-{threading.get_ident()}.metrics",
+                )
+            )
+    return metrics_file
+
+
+def read_values():
+    """Sum the slots of every metrics file, keyed by metric key"""
+    values = {}
+    directory = settings.METRICS_DIR
+    if not os.path.isdir(directory):
+        return values
+
+    for name in os.listdir(directory):
+        if not name.endswith(".metrics"):
+            continue
+        with open(os.path.join(directory, name), "rb") as metrics_file:
+            data = metrics_file.read()
+        if len(data) < HEADER.size:
+            continue
+        used = HEADER.unpack_from(data)[0]
+        for key, offset, slots in _entries(data, used):
+            totals = values.setdefault(key, [0.0] * slots)
+            for slot in range(slots):
+                totals[slot] += VALUE.unpack_from(
+                    data, offset + slot * VALUE.size
+                )[0]
+    return values
+
+
+REGISTRY = []
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{json.dumps(str(value))[1:-1]}"'
+        for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}"
+
+
+def _value(value):
+    """Format a sample without losing precision, integers without ``.0``"""
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    def inc(self, *labelvalues, amount=1):
+        _file().add((self.name, *labelvalues), 1, 0, amount)
+
+    def render(self, values):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        samples = [
+            (key[1:], slots[0])
+            for key, slots in sorted(values.items())
+            if key[0] == self.name
+        ]
+        if not samples and not self.labelnames:
+            samples = [((), 0)]
+        for labelvalues, value in samples:
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}{labels} {_value(value)}")
+        return lines
+
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Histogram stored as per-bucket counts followed by sum and count"""
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._slots = len(self.buckets) + 3
+        REGISTRY.append(self)
+
+    def observe(self, value, *labelvalues):
+        metrics_file = _file()
+        key = (self.name, *labelvalues)
+        bucket = bisect.bisect_left(self.buckets, value)
+        metrics_file.add(key, self._slots, bucket, 1)
+        metrics_file.add(key, self._slots, self._slots - 2, value)
+        metrics_file.add(key, self._slots, self._slots - 1, 1)
+
+    def render(self, values):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        for key, slots in sorted(values.items()):
+            if key[0] != self.name:
+                continue
+            names = (*self.labelnames, "le")
+            cumulative = 0
+            for bound, count in zip(bounds, slots):
+                cumulative += count
+                labels = _labels(names, (*key[1:], bound))
+                lines.append(
+                    f"{self.name}_bucket{labels} {_value(cumulative)}"
+                )
+            labels = _labels(self.labelnames, key[1:])
+            lines.append(f"{self.name}_sum{labels} {_value(slots[-2])}")
+            lines.append(f"{self.name}_count{labels} {_value(slots[-1])}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling requests, by route name.",
+    labelnames=("route", "method"),
+)
+
+DB_QUERY_TIME = Histogram(
+    "db_query_duration_seconds",
+    "Time spent executing database queries.",
+    labelnames=("database",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1),
+)
+
+
+def _time_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        DB_QUERY_TIME.observe(
+            time.perf_counter() - started, context["connection"].alias
+        )
+
+
+def _wrap_connection(connection, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+def _record_request(request, started):
+    match = getattr(request, "resolver_match", None)
+    REQUEST_LATENCY.observe(
+        time.perf_counter() - started,
+        match.view_name if match else "unmatched",
+        request.method,
+    )
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """Record request latencies and query times"""
+    connection_created.connect(_wrap_connection, dispatch_uid="metrics")
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started = time.perf_counter()
+            response = await get_response(request)
+            _record_request(request, started)
+            return response
+
+    else:
+
+        def middleware(request):
+            started = time.perf_counter()
+            response = get_response(request)
+            _record_request(request, started)
+            return response
+
+    return middleware
+
+
+def metrics_view(request):
+    """Expose the metrics of all processes in the text exposition format"""
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+
+    values = read_values()
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render(values))
+    return HttpResponse("\n".join(lines) + "\n", content_type=CONTENT_TYPE)
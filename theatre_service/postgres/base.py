@@ -0,0 +1,71 @@
+"""
+PostgreSQL backend counting how often persistent connections are reused.
+
+With ``CONN_MAX_AGE`` every worker thread keeps its connection between
+requests, a pool of one per thread. A request that finds the connection
+of its thread open is a pool hit, one that has to connect is a miss.
+Connections closed at request boundaries (maximum age reached, broken)
+and ones failing the pre-use health check are counted too. Counts of
+all processes are exported on ``/metrics``.
+"""
+import threading
+from collections import Counter
+
+from django.db.backends.postgresql import base
+
+from theatre_service import metrics
+
+POOL_EVENTS = metrics.Counter(
+    "db_connection_pool_events_total",
+    "Persistent connection reuse (hits), connects (misses), closes and "
+    "failed health checks.",
+    labelnames=("database", "event"),
+)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _record(alias, event):
+    with _stats_lock:
+        _stats[event] += 1
+    POOL_EVENTS.inc(alias, event)
+
+
+def pool_stats():
+    """Return connection reuse counters of this process"""
+    with _stats_lock:
+        return {
+            event: _stats[event]
+            for event in ("hits", "misses", "closed", "health_check_failures")
+        }
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkout_pending = True
+
+    def connect(self):
+        _record(self.alias, "misses")
+        self._checkout_pending = False
+        super().connect()
+
+    def ensure_connection(self):
+        if self.connection is not None and self._checkout_pending:
+            _record(self.alias, "hits")
+            self._checkout_pending = False
+        super().ensure_connection()
+
+    def close_if_health_check_failed(self):
+        connected = self.connection is not None
+        super().close_if_health_check_failed()
+        if connected and self.connection is None:
+            _record(self.alias, "health_check_failures")
+
+    def close_if_unusable_or_obsolete(self):
+        connected = self.connection is not None
+        super().close_if_unusable_or_obsolete()
+        if connected and self.connection is None:
+            _record(self.alias, "closed")
+        self._checkout_pending = True
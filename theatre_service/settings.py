@@ -1,4 +1,8 @@
+import atexit
 import os
+import shutil
+import sys
+import tempfile
 
 from pathlib import Path
 
@@ -12,6 +16,9 @@ SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
 
 DEBUG = True
 
+# manage.py test, python -m django test and pytest
+TESTING = sys.argv[1:2] == ["test"] or "pytest" in sys.modules
+
 ALLOWED_HOSTS = []
 
 INTERNAL_IPS = [
@@ -34,7 +41,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "theatre_service.instrumentation.instrumentation_middleware",
+    "theatre_service.metrics.metrics_middleware",
     "django.middleware.security.SecurityMiddleware",
+    "theatre_service.db_router.primary_pinning_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -65,11 +75,16 @@ WSGI_APPLICATION = "theatre_service.wsgi.application"
 
 DATABASES = {
     "postgres": {
-        "ENGINE": "django.db.backends.postgresql",
+        # counts reuse of persistent connections, see pool_stats()
+        "ENGINE": "theatre_service.postgres",
         "NAME": os.getenv("POSTGRES_DB"),
         "USER": os.getenv("POSTGRES_USER"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
+        # seconds a worker thread keeps its connection, 0 closes it after
+        # every request
+        "CONN_MAX_AGE": int(os.getenv("POSTGRES_CONN_MAX_AGE", 300)),
+        "CONN_HEALTH_CHECKS": True,
     },
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
@@ -77,6 +92,28 @@ DATABASES = {
     },
 }
 
+# a local SQLite file standing in for a read replica of the default
+# database, e.g. SQLITE_REPLICA=db-replica.sqlite3 DATABASE_REPLICAS=replica
+if os.getenv("SQLITE_REPLICA"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / os.getenv("SQLITE_REPLICA"),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# writes (and reads of pinned requests) go to the primary alias, reads of
+# safe requests to a random replica alias, see theatre_service/db_router.py
+DATABASE_PRIMARY = os.getenv("DATABASE_PRIMARY", "default")
+
+DATABASE_REPLICAS = [
+    alias for alias in os.getenv("DATABASE_REPLICAS", "").split(",") if alias
+]
+
+# how long clients read from the primary after a write
+DATABASE_PIN_SECONDS = int(os.getenv("DATABASE_PIN_SECONDS", 5))
+
+DATABASE_ROUTERS = ["theatre_service.db_router.PrimaryReplicaRouter"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation."
@@ -117,15 +154,175 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "theatre.throttling.AnonRateThrottle",
+        "theatre.throttling.UserRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/minute", "user": "30/minute"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/minute",
+        "user": "30/minute",
+        "reservation": "5/minute",
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.ClaimsJWTAuthentication",
     ),
 }
 
+# tokens carry the user claims, so requests are authenticated without
+# loading the user, see user/authentication.py
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "user.authentication."
+    "ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.authentication."
+    "ClaimsTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "user.authentication.ClaimsUser",
+}
+
+# off in test runs, tests reuse user ids and addresses so buckets would
+# leak between test cases, throttle tests enable it
+THROTTLE_ENABLED = (
+    os.getenv("THROTTLE_ENABLED", "0" if TESTING else "1") != "0"
+)
+
+# token buckets of the throttles, shared by the processes of a host
+THROTTLE_DATABASE = os.getenv(
+    "THROTTLE_DATABASE",
+    os.path.join(tempfile.gettempdir(), "theatre-throttle.sqlite3"),
+)
+if TESTING:
+    # a fresh database per test run, removed when the run ends
+    THROTTLE_DATABASE = os.path.join(
+        tempfile.mkdtemp(prefix="theatre-throttle-"), "throttle.sqlite3"
+    )
+    atexit.register(
+        shutil.rmtree, os.path.dirname(THROTTLE_DATABASE), ignore_errors=True
+    )
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # rendered reference data responses, see theatre/cache.py
+    "responses": {
+        "BACKEND": CACHE_BACKENDS[
+            os.getenv(
+                "RESPONSE_CACHE_BACKEND", "dummy" if TESTING else "locmem"
+            )
+        ],
+        "LOCATION": os.getenv(
+            "RESPONSE_CACHE_LOCATION", "theatre-responses"
+        ),
+        "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", 24 * 60 * 60)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1000)),
+        },
+    },
+    # model versions keying the cached responses, shared by the processes
+    # of a host so writes from any of them invalidate every process's
+    # responses
+    "response_versions": {
+        "BACKEND": CACHE_BACKENDS[
+            os.getenv(
+                "RESPONSE_VERSION_CACHE_BACKEND",
+                "dummy" if TESTING else "file",
+            )
+        ],
+        "LOCATION": os.getenv(
+            "RESPONSE_VERSION_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "theatre-response-versions"),
+        ),
+        "TIMEOUT": None,
+    },
+    # pre-rendered PlayListSerializer output per play, refreshed by every
+    # process changing plays, so the backend is shared by the processes of
+    # a host and the timeout bounds staleness across hosts
+    "play_cards": {
+        "BACKEND": CACHE_BACKENDS[
+            os.getenv(
+                "PLAY_CARD_CACHE_BACKEND", "dummy" if TESTING else "file"
+            )
+        ],
+        "LOCATION": os.getenv(
+            "PLAY_CARD_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "theatre-cards"),
+        ),
+        "TIMEOUT": int(os.getenv("PLAY_CARD_CACHE_TIMEOUT", 60 * 60)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(
+                os.getenv("PLAY_CARD_CACHE_MAX_ENTRIES", 50000)
+            ),
+        },
+    },
+    # token versions of users, the timeout bounds how long a revoked token
+    # is accepted by processes that did not revoke it
+    "token_versions": {
+        "BACKEND": CACHE_BACKENDS[
+            os.getenv(
+                "TOKEN_VERSION_CACHE_BACKEND", "dummy" if TESTING else "locmem"
+            )
+        ],
+        "LOCATION": os.getenv(
+            "TOKEN_VERSION_CACHE_LOCATION", "theatre-token-versions"
+        ),
+        "TIMEOUT": int(os.getenv("TOKEN_VERSION_CACHE_TIMEOUT", 60)),
+    },
+}
+
+SEAT_HOLD_MINUTES = 10
+
+SEAT_HOLD_MAX_MINUTES = 30
+
+# performances created by one recurring schedule request at most
+SCHEDULE_MAX_PERFORMANCES = 1000
+
+# threads rendering play image variants, 0 renders them inline on commit
+PLAY_IMAGE_WORKERS = int(
+    os.getenv("PLAY_IMAGE_WORKERS", 0 if TESTING else 2)
+)
+
+# Server-Timing headers and JSON log lines with the query count, database,
+# serializer and total time of every request
+REQUEST_INSTRUMENTATION = os.getenv("REQUEST_INSTRUMENTATION", "0") == "1"
+
+# requests slower than this are logged with their SQL, at the sample rate
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", 500))
+
+SLOW_REQUEST_SAMPLE_RATE = float(os.getenv("SLOW_REQUEST_SAMPLE_RATE", 1))
+
+SLOW_REQUEST_MAX_QUERIES = 100
+
+# per-process metric files summed by /metrics, empty it on server start
+METRICS_DIR = os.getenv(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "theatre-metrics")
+)
+if TESTING:
+    # a fresh directory per test run, removed when the run ends
+    METRICS_DIR = tempfile.mkdtemp(prefix="theatre-metrics-")
+    atexit.register(shutil.rmtree, METRICS_DIR, ignore_errors=True)
+
+# bearer token required by /metrics when set
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "theatre_service.instrumentation": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Theatre Service API",
     "DESCRIPTION": "Order tickets for play you want seeing",
@@ -24,6 +24,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from theatre_service.metrics import metrics_view
+
 urlpatterns = [
     path(
         "admin/",
@@ -56,4 +58,10 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name="schema"),
         name="redoc"
     ),
+
+    path(
+        "metrics",
+        metrics_view,
+        name="metrics"
+    ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_service.settings")
 
 application = get_wsgi_application()
+
+if os.getenv("DATABASE_PREWARM"):
+    # open the connections of this worker before the first request
+    from django.conf import settings
+    from django.db import connections
+
+    for alias in {settings.DATABASE_PRIMARY, *settings.DATABASE_REPLICAS}:
+        connections[alias].ensure_connection()
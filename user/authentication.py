@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+TOKEN_VERSION_CACHE = "token_versions"
+
+VERSION_CLAIM = "token_version"
+
+
+def _version_key(user_id):
+    return f"token-version:{user_id}"
+
+
+def get_token_version(user_id):
+    """Return the token version of a user, cached to spare the users table
+
+    Returns None for users that do not exist.
+    """
+    cache = caches[TOKEN_VERSION_CACHE]
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = (
+            get_user_model()
+            .objects.filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            cache.set(_version_key(user_id), version)
+    return version
+
+
+def forget_token_version(user_id):
+    """Drop the cached token version after it changed"""
+    caches[TOKEN_VERSION_CACHE].delete(_version_key(user_id))
+
+
+def check_token_version(token):
+    """Reject tokens issued before the claims of their user changed"""
+    version = get_token_version(token[api_settings.USER_ID_CLAIM])
+    if version is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if token.get(VERSION_CLAIM) != version:
+        raise InvalidToken(_("Token has been revoked"))
+
+
+class ClaimsUser(TokenUser):
+    """User built from signed token claims, without a database query"""
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", False)
+
+    def __str__(self):
+        return self.email
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Authenticate JWTs as ``ClaimsUser`` instead of loading the user
+
+    Views needing the full user model fetch it by ``request.user.id``.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        check_token_version(validated_token)
+
+        user = ClaimsUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["email"] = user.email
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token["is_active"] = user.is_active
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        check_token_version(RefreshToken(attrs["refresh"]))
+        return super().validate(attrs)
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from user.authentication import forget_token_version
+from user.models import User
+
+# fields copied into token claims or guarding them
+CLAIM_FIELDS = ("email", "password", "is_staff", "is_superuser", "is_active")
+
+
+@receiver(pre_save, sender=User)
+def detect_claim_changes(sender, instance, update_fields=None, **kwargs):
+    instance._claims_changed = False
+    if instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(
+        CLAIM_FIELDS
+    ):
+        return
+
+    current = User.objects.filter(pk=instance.pk).values(*CLAIM_FIELDS)
+    current = current.first()
+    instance._claims_changed = current is not None and any(
+        current[field] != getattr(instance, field) for field in CLAIM_FIELDS
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(sender, instance, **kwargs):
+    """Invalidate issued tokens when the claims they carry changed"""
+    if not getattr(instance, "_claims_changed", False):
+        return
+
+    User.objects.filter(pk=instance.pk).update(
+        token_version=F("token_version") + 1
+    )
+    instance.refresh_from_db(fields=["token_version"])
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_token_version(user_id))
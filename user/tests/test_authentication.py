@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+TOKEN_REFRESH_URL = reverse("user:token_refresh")
+MANAGE_URL = reverse("user:manage")
+PLAY_URL = reverse("theatre:play-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "password"
+        )
+
+    def obtain_tokens(self):
+        res = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "password"}
+        )
+        return res.data
+
+    def authorize(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+            "token_versions": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-token-versions",
+            },
+        }
+    )
+    def test_requests_authenticated_from_claims(self):
+        caches["token_versions"].clear()
+        self.authorize(self.obtain_tokens()["access"])
+        self.client.get(RESERVATION_URL)
+
+        # only the reservations are queried, the user is not loaded
+        with self.assertNumQueries(1):
+            res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_manage_user_loads_full_user(self):
+        self.authorize(self.obtain_tokens()["access"])
+
+        res = self.client.get(MANAGE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], "test@test.com")
+
+    def test_staff_claim_changes_revoke_tokens(self):
+        tokens = self.obtain_tokens()
+        self.authorize(tokens["access"])
+
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.get(PLAY_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        res = self.client.post(
+            TOKEN_REFRESH_URL, {"refresh": tokens["refresh"]}
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.authorize(self.obtain_tokens()["access"])
+        res = self.client.post(PLAY_URL, {"title": "Play"})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_login_does_not_revoke_tokens(self):
+        self.authorize(self.obtain_tokens()["access"])
+        self.client.login(email="test@test.com", password="password")
+
+        res = self.client.get(PLAY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)